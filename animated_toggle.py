@@ -1,13 +1,37 @@
-from PyQt5.QtCore import Qt, QSize, QPoint, QPointF, QRectF, QEasingCurve, QPropertyAnimation, QParallelAnimationGroup, pyqtSlot, pyqtProperty
+import time
+from PyQt5.QtCore import Qt, QSize, QPoint, QPointF, QRectF, QEasingCurve, QEvent, QPropertyAnimation, QParallelAnimationGroup, pyqtSlot, pyqtProperty
 from PyQt5.QtWidgets import QCheckBox
 from PyQt5.QtGui import QColor, QFont, QBrush, QPen, QPainter, QFontDatabase, QFontMetrics
+from instrumentation import Instrumentation
+
+LABEL_FONT_FAMILY = "Silom"
+LABEL_POINT_SIZE = 16
+LABELS = ("12hr", "24hr")
+
+# Add fixed margins to control the overall size and placement
+LEFT_MARGIN = 8
+RIGHT_MARGIN = 12
+TOP_MARGIN = 0
+BOTTOM_MARGIN = 0
 
 class AnimatedToggle(QCheckBox):
-    """Custom QCheckBox widget that behaves like a toggle switch with animations."""
+    """
+    Custom QCheckBox widget that behaves like a toggle switch with animations.
+
+    Everything paintEvent needs besides the handle position is resolved ahead of time:
+    the label font, its metrics and the label widths once per point size, brushes once
+    per color (all shared by every toggle), and the bar geometry once per widget size.
+    An animation frame is then just drawing.
+    """
 
     # Define shared pen objects for transparency and default styles
     _transparent_pen = QPen(Qt.transparent)
     _light_grey_pen = QPen(Qt.lightGray)
+    _active_label_pen = QPen(QColor(50, 250, 250))  # Cyan color
+    _inactive_label_pen = QPen(QColor(0, 0, 0, 0))  # Transparent color
+
+    _label_styles = {}  # point size -> (QFont, {label: width})
+    _brushes = {}  # rgba -> QBrush
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -40,6 +64,8 @@ class AnimatedToggle(QCheckBox):
         self.animations_group.addAnimation(self.pulse_anim)
 
         self.stateChanged.connect(self.setup_animation)
+        self.instruments = Instrumentation()
+        self._update_geometry()
   
     def sizeHint(self):
         return QSize(40,30)
@@ -54,119 +80,116 @@ class AnimatedToggle(QCheckBox):
         self.animation.setEndValue(1 if value else 0)
         self.animations_group.start()
 
-    def paintEvent(self, e):
-        """Custom paint event to draw the toggle with dynamic labels."""
+    @classmethod
+    def label_style(cls, point_size=LABEL_POINT_SIZE):
+        """Return the shared label font and label widths for a point size, resolving them on first use."""
+        style = cls._label_styles.get(point_size)
+        if style is None:
+            if LABEL_FONT_FAMILY in QFontDatabase().families():
+                f = QFont(LABEL_FONT_FAMILY)
+            else:
+                f = QFont()
+                f.setStyleHint(QFont.StyleHint.SansSerif)
+            f.setWeight(65)  # Set font weight (0-99)
+            f.setStretch(105)  # 100 is normal stretch
+            f.setPointSize(point_size)  # Set font size
+            f.setStyleStrategy(QFont.StyleStrategy.PreferOutline)
+            font_metrics = QFontMetrics(f)
+            style = (f, {label: font_metrics.horizontalAdvance(label) for label in LABELS})
+            cls._label_styles[point_size] = style
+        return style
+
+    @classmethod
+    def brush(cls, color):
+        """Return the shared solid brush for a color."""
+        key = color.rgba()
+        brush = cls._brushes.get(key)
+        if brush is None:
+            brush = cls._brushes[key] = QBrush(color)
+        return brush
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        self._update_geometry()
+
+    def changeEvent(self, e):
+        super().changeEvent(e)
+        if e.type() in (QEvent.StyleChange, QEvent.ContentsRectChange):
+            self._update_geometry()
+
+    def _update_geometry(self):
+        """Lay out the bar for the current size; only the handle position varies between frames."""
         contRect = self.contentsRect()
 
-        # Add fixed margins to control the overall size and placement
-        left_margin = 8
-        right_margin = 12
-        top_margin = 0
-        bottom_margin = 0
+        # Adjust the rectangle dimensions based on the fixed margins
+        inner_width = contRect.width() - LEFT_MARGIN - RIGHT_MARGIN
+        inner_height = contRect.height() - TOP_MARGIN - BOTTOM_MARGIN
+        self._handle_radius = round(0.4 * inner_height)
+        self._trail_length = contRect.width() - 4 * self._handle_radius
+        self._trail_start = contRect.x() + 2 * self._handle_radius
+
+        # The bar (with fixed margins)
+        self._bar_rect = QRectF(
+            LEFT_MARGIN,
+            TOP_MARGIN,
+            inner_width - self._handle_radius,
+            0.5 * inner_height
+        )
+        self._bar_rect.moveCenter(
+            QPointF(
+                LEFT_MARGIN + inner_width / 2,
+                TOP_MARGIN + inner_height / 2
+            )
+        )
+        self._rounding = self._bar_rect.height() / 2  # Makes for pill-like appearance
+        self._label_y = self._bar_rect.center().y() + 5
+        self._inactive_label_x = contRect.x() + 5 + self._handle_radius
 
-        # Adjust the rectangle dimensions based on these margins
-        inner_width = contRect.width() - left_margin - right_margin
-        inner_height = contRect.height() - top_margin - bottom_margin
-        handle_radius = round(0.4 * inner_height)
-        trailLength = contRect.width() - 4 * handle_radius
-        xPos = contRect.x() + 2 * handle_radius + trailLength * self._handle_position
+    def paintEvent(self, e):
+        """Custom paint event to draw the toggle with dynamic labels."""
+        start = time.perf_counter() if self.instruments.enabled else None
+        checked = self.isChecked()
+        xPos = self._trail_start + self._trail_length * self._handle_position
+        center_y = self._bar_rect.center().y()
 
         # Setup painter
         p = QPainter(self)
         p.setRenderHint(QPainter.Antialiasing)
         p.setPen(self._transparent_pen)
 
-        # Draw the bar (with fixed margins)
-        bar_rect = QRectF(
-            left_margin,
-            top_margin,
-            inner_width - handle_radius,
-            0.5 * inner_height
-        )
-        bar_rect.moveCenter(
-            QPointF(
-                left_margin + inner_width / 2,
-                top_margin + inner_height / 2
-            )
-        )
-        rounding = bar_rect.height() / 2  # Makes for pill-like appearance
-        bar_brush = QBrush(
-            self.bar_color_checked if self.isChecked() else self.bar_color_unchecked
-        )
-        p.setBrush(bar_brush)
-        p.drawRoundedRect(bar_rect, rounding, rounding)
+        # Draw the bar
+        p.setBrush(self.brush(self.bar_color_checked if checked else self.bar_color_unchecked))
+        p.drawRoundedRect(self._bar_rect, self._rounding, self._rounding)
 
         # Draw pulse animation (smaller pulse)
         if self.pulse_anim.state() == QPropertyAnimation.Running:
-            pulse_brush = QBrush(
-                self.pulse_checked_color if self.isChecked() else self.pulse_unchecked_color
-            )
-            p.setBrush(pulse_brush)
-            p.drawEllipse(
-                QPointF(xPos, bar_rect.center().y()),
-                self._pulse_radius,
-                self._pulse_radius
-            )
+            p.setBrush(self.brush(self.pulse_checked_color if checked else self.pulse_unchecked_color))
+            p.drawEllipse(QPointF(xPos, center_y), self._pulse_radius, self._pulse_radius)
 
         # Draw the handle (smaller handle)
-        handle_brush = QBrush(self.handle_color)
-        p.setBrush(handle_brush)
-        p.drawEllipse(
-            QPointF(xPos, bar_rect.center().y()),
-            handle_radius,
-            handle_radius
-        )
+        p.setBrush(self.brush(self.handle_color))
+        p.drawEllipse(QPointF(xPos, center_y), self._handle_radius, self._handle_radius)
 
         # Draw labels (24hr / 12hr) at handle location using the same painter 'p'
-
-        # Setup font
-        font_name = "Silom"
-        font_db = QFontDatabase()
-        if font_name in font_db.families():
-            f = QFont(font_name)
-        else:
-            f = QFont()
-            f.setStyleHint(QFont.StyleHint.SansSerif)
-            
-        f.setWeight(65)  # Set font weight (0-99)
-        f.setStretch(105)  # 100 is normal stretch
-        f.setPointSize(16)  # Set font size
-        f.setStyleStrategy(QFont.StyleStrategy.PreferOutline)
-
-        p.setFont(f)  # Set the font on the painter
+        f, label_widths = self.label_style()
+        p.setFont(f)
 
         # Logic to enlarge and change color for active label
-        if self.isChecked():
-            # 24hr label active
-            p.setPen(QPen(QColor(50, 250, 250)))  # Cyan color
-            font_metrics = QFontMetrics(f)
-            text_width = font_metrics.width("24hr")
-            p.drawText(
-                QPointF(xPos - text_width+5, bar_rect.center().y() + 5),
-                "24hr"
-            )
-
-            # 12hr label inactive (transparent)
-            p.setPen(QPen(QColor(0, 0, 0, 0)))  # Transparent color
-            p.drawText(
-                QPointF(contRect.x() + 5 + handle_radius, bar_rect.center().y() + 5),
-                "12hr"
-            )
+        if checked:
+            # 24hr label active, 12hr label inactive (transparent)
+            p.setPen(self._active_label_pen)
+            p.drawText(QPointF(xPos - label_widths["24hr"] + 5, self._label_y), "24hr")
+            p.setPen(self._inactive_label_pen)
+            p.drawText(QPointF(self._inactive_label_x, self._label_y), "12hr")
         else:
-            # 12hr label active
-            p.setPen(QPen(QColor(50, 250, 250)))  # Cyan color
-            p.drawText(
-                QPointF(xPos - 10, bar_rect.center().y() + 5),
-                "12hr"
-            )
-
-            # 24hr label inactive (transparent)
-            p.setPen(QPen(QColor(0, 0, 0, 0)))  # Transparent color
-            p.drawText(
-                QPointF(contRect.x() + 5 + handle_radius, bar_rect.center().y() + 5),
-                "24hr"
-            )
+            # 12hr label active, 24hr label inactive (transparent)
+            p.setPen(self._active_label_pen)
+            p.drawText(QPointF(xPos - 10, self._label_y), "12hr")
+            p.setPen(self._inactive_label_pen)
+            p.drawText(QPointF(self._inactive_label_x, self._label_y), "24hr")
         p.end()
+        if start is not None:
+            self.instruments.record("paint.toggle", (time.perf_counter() - start) * 1000)
     
     @pyqtProperty(float)
     def handle_position(self):
@@ -0,0 +1,188 @@
+import logging
+import os
+import time
+import wave
+from PyQt5.QtCore import QObject, QBuffer, QByteArray, QIODevice, QUrl
+from PyQt5.QtMultimedia import (
+    QAudio, QAudioDecoder, QAudioDeviceInfo, QAudioFormat, QAudioOutput, QMediaContent, QMediaPlayer
+)
+
+OUTPUT_BUFFER_BYTES = 4096  # small device buffer keeps the start latency low
+START_LATENCY_TARGET_MS = 20
+
+
+class AudioEngine(QObject):
+    """
+    Plays the hourly clip from PCM decoded ahead of time.
+
+    The clip is decoded once per path (and file modification time) into a buffer shared
+    by every engine in the process, so playback starts straight from memory instead of
+    spinning up a decoder on the hour. Where the platform offers no decoder backend, a
+    QMediaPlayer is preloaded with the clip as a fallback.
+    """
+
+    _pcm_cache = {}  # (path, mtime) -> (QAudioFormat, QByteArray)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._key = None
+        self._format = None
+        self._pcm = None
+        self._decoder = None
+        self._chunks = []
+        self._output = None
+        self._buffer = QBuffer(self)
+        self._player = None
+        self._volume = 1.0
+        self._play_requested_at = None
+        self.last_start_latency_ms = None
+
+    def load(self, path):
+        """Decode the clip at path unless it is already loaded."""
+        path = str(path)
+        try:
+            key = (path, os.path.getmtime(path))
+        except OSError as e:
+            logging.error(f"Audio file not found: {path} ({e})")
+            return
+        if key == self._key:
+            return
+
+        self._release()
+        self._key = key
+
+        cached = self._pcm_cache.get(key)
+        if cached is not None:
+            self._set_pcm(*cached)
+        elif path.lower().endswith(".wav"):
+            self._load_wav(path)
+        else:
+            self._decode(path)
+
+    def set_volume(self, level):
+        """Set the playback volume from a linear level between 0 and 1."""
+        self._volume = level
+        if self._output is not None:
+            self._output.setVolume(level)
+        if self._player is not None:
+            self._player.setVolume(int(level * 100))
+
+    def play(self):
+        """Start the clip from the beginning."""
+        self._play_requested_at = time.perf_counter()
+        if self._output is not None:
+            self._output.stop()
+            self._buffer.close()
+            self._buffer.setData(self._pcm)  # implicitly shared, no copy
+            self._buffer.open(QIODevice.ReadOnly)
+            self._output.start(self._buffer)
+        elif self._player is not None:
+            self._player.setPosition(0)
+            self._player.play()
+        else:
+            logging.warning("Audio clip is not ready yet; skipping playback.")
+
+    def stop(self):
+        if self._output is not None:
+            self._output.stop()
+        if self._player is not None:
+            self._player.stop()
+
+    def _release(self):
+        """Drop the current clip, its output and any decode still in progress."""
+        self.stop()
+        if self._decoder is not None:
+            self._decoder.stop()
+        for obj in (self._decoder, self._output, self._player):
+            if obj is not None:
+                obj.deleteLater()
+        self._decoder = self._output = self._player = None
+        self._format = self._pcm = None
+        self._chunks = []
+
+    def _load_wav(self, path):
+        """Read an uncompressed wav directly, no decoder backend needed."""
+        try:
+            with wave.open(path, "rb") as wav:
+                fmt = QAudioFormat()
+                fmt.setSampleRate(wav.getframerate())
+                fmt.setChannelCount(wav.getnchannels())
+                fmt.setSampleSize(wav.getsampwidth() * 8)
+                fmt.setCodec("audio/pcm")
+                fmt.setByteOrder(QAudioFormat.LittleEndian)
+                fmt.setSampleType(QAudioFormat.UnSignedInt if wav.getsampwidth() == 1 else QAudioFormat.SignedInt)
+                data = QByteArray(wav.readframes(wav.getnframes()))
+        except (wave.Error, EOFError) as e:
+            logging.warning(f"Could not read {path} as PCM wav, using the media player instead: {e}")
+            self._use_player(path)
+            return
+        self._store_pcm(fmt, data)
+
+    def _decode(self, path):
+        decoder = QAudioDecoder(self)
+        if not decoder.isAvailable():
+            logging.info("No audio decoder backend available, preloading the clip in a media player.")
+            decoder.deleteLater()
+            self._use_player(path)
+            return
+        self._decoder = decoder
+        self._chunks = []
+        decoder.bufferReady.connect(self._on_buffer_ready)
+        decoder.finished.connect(self._on_decode_finished)
+        decoder.error.connect(self._on_decode_error)
+        decoder.setSourceFilename(path)
+        decoder.start()
+
+    def _on_buffer_ready(self):
+        buffer = self._decoder.read()
+        if buffer.isValid():
+            self._format = buffer.format()
+            self._chunks.append(buffer.constData().asstring(buffer.byteCount()))
+
+    def _on_decode_finished(self):
+        decoder, self._decoder = self._decoder, None
+        decoder.deleteLater()
+        if self._format is None:
+            logging.warning("Decoder produced no audio, using the media player instead.")
+            self._use_player(self._key[0])
+            return
+        self._store_pcm(self._format, QByteArray(b"".join(self._chunks)))
+        self._chunks = []
+
+    def _on_decode_error(self, error):
+        decoder, self._decoder = self._decoder, None
+        logging.warning(f"Failed to decode {self._key[0]}: {decoder.errorString()}; using the media player instead.")
+        decoder.deleteLater()
+        self._chunks = []
+        self._use_player(self._key[0])
+
+    def _store_pcm(self, fmt, data):
+        self._pcm_cache[self._key] = (fmt, data)
+        self._set_pcm(fmt, data)
+
+    def _set_pcm(self, fmt, data):
+        if not QAudioDeviceInfo.defaultOutputDevice().isFormatSupported(fmt):
+            logging.warning("Output device does not support the decoded format, using the media player instead.")
+            self._use_player(self._key[0])
+            return
+        self._format, self._pcm = fmt, data
+        self._output = QAudioOutput(fmt, self)
+        self._output.setBufferSize(OUTPUT_BUFFER_BYTES)
+        self._output.setVolume(self._volume)
+        self._output.stateChanged.connect(self._on_state_changed)
+
+    def _use_player(self, path):
+        """Fallback: preload the clip so at least loading and buffering happen ahead of time."""
+        self._output = None
+        self._player = QMediaPlayer(self)
+        self._player.setMedia(QMediaContent(QUrl.fromLocalFile(path)))
+        self._player.setVolume(int(self._volume * 100))
+
+    def _on_state_changed(self, state):
+        if state == QAudio.ActiveState and self._play_requested_at is not None:
+            self.last_start_latency_ms = (time.perf_counter() - self._play_requested_at) * 1000
+            self._play_requested_at = None
+            if self.last_start_latency_ms > START_LATENCY_TARGET_MS:
+                logging.warning(f"Hourly clip started {self.last_start_latency_ms:.1f} ms after the request")
+            else:
+                logging.debug(f"Hourly clip started {self.last_start_latency_ms:.1f} ms after the request")
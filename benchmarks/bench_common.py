@@ -0,0 +1,15 @@
+"""Helpers shared by the benchmark scripts."""
+import pathlib
+import subprocess
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def git_revision():
+    """The current commit, marked -dirty if the tree has changes, for labelling results."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=REPO_ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        return "unknown"
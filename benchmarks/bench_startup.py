@@ -0,0 +1,79 @@
+"""
+Time-to-first-frame regression benchmark.
+
+Launches bigclock.py several times offscreen with --profile-startup, collects the
+startup milestones, appends the medians for the current git commit to a JSON-lines
+history file and compares them with the previous entry.
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import tempfile
+from bench_common import REPO_ROOT, git_revision
+
+DEFAULT_HISTORY = pathlib.Path(__file__).resolve().parent / "startup_history.jsonl"
+
+
+def seed_settings():
+    """A settings file of defaults in a temporary directory, so the runs start like a returning user's
+    clock and the developer's own settings and calendars stay out of the measurements."""
+    path = pathlib.Path(tempfile.mkdtemp()) / "settings.json"
+    path.write_text("{}")
+    return path
+
+
+def run_once(settings_path):
+    """Start the clock once and return its startup profile."""
+    env = dict(
+        os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"), ADHD_CLOCK_CONFIG=str(settings_path)
+    )
+    result = subprocess.run(
+        [sys.executable, "bigclock.py", "--profile-startup", "--skip-settings", "--exit-after-first-frame"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=60,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP_PROFILE "):
+            return json.loads(line[len("STARTUP_PROFILE "):])
+    raise RuntimeError(f"bigclock.py produced no startup profile:\n{result.stderr}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--history", type=pathlib.Path, default=DEFAULT_HISTORY)
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown of first-frame that counts as a regression")
+    args = parser.parse_args()
+
+    settings_path = seed_settings()
+    runs = [run_once(settings_path) for _ in range(args.runs)]
+    names = sorted({name for run in runs for name in run["marks"]})
+    medians = {name: statistics.median(run["marks"][name] for run in runs if name in run["marks"]) for name in names}
+    entry = {"revision": git_revision(), "runs": args.runs, "median_ms": medians}
+
+    previous = None
+    if args.history.exists():
+        lines = args.history.read_text().splitlines()
+        previous = json.loads(lines[-1]) if lines else None
+    with args.history.open("a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+    print(json.dumps(entry, indent=2))
+    if previous and "first-frame" in previous["median_ms"] and "first-frame" in medians:
+        before, after = previous["median_ms"]["first-frame"], medians["first-frame"]
+        change = (after - before) / before
+        print(f"first-frame: {before:.1f} ms ({previous['revision']}) -> {after:.1f} ms ({change:+.1%})")
+        if change > args.threshold:
+            print("Regression: time to first frame grew beyond the threshold")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+"""
+Headless benchmark suite for the clock, flash and wiggle paths.
+
+Runs under QT_QPA_PLATFORM=offscreen on a plain Linux box and reports the mean and
+p99 time of each benchmark, as JSON, so results can be compared between commits:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --compare before.json
+"""
+import argparse
+import json
+import os
+import pathlib
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from bench_common import REPO_ROOT, git_revision
+
+sys.path.insert(0, str(REPO_ROOT))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Keep the user's saved settings out of the measurements
+os.environ["ADHD_CLOCK_CONFIG"] = str(pathlib.Path(tempfile.mkdtemp()) / "settings.json")
+
+# bigclock sets the HiDPI attribute at import, which has to happen before the QApplication exists
+import bigclock  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+WINDOW_SIZES = [(400, 90), (800, 120), (1920, 300), (2560, 1440), (3840, 2160)]
+
+
+def summarize(samples_ms):
+    ordered = sorted(samples_ms)
+    p99 = ordered[min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))]
+    return {"n": len(ordered), "mean_ms": statistics.fmean(ordered), "p99_ms": p99}
+
+
+def measure(fn, repeat, warmup=3):
+    """Time fn() repeat times after a few untimed warm-up calls; returns ms per call."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def bench_clock(app, results, repeat):
+    window = bigclock.MainWindow()
+    window.show()
+    app.processEvents()
+    clock = window.clock_app
+
+    results["clock.paint_full"] = summarize(measure(clock.repaint, repeat))
+
+    now = [datetime(2024, 1, 1, 12, 0, 1)]
+
+    def tick():
+        now[0] += timedelta(seconds=1)
+        clock.update_time(now[0])
+
+    def tick_and_paint():
+        tick()
+        app.processEvents()
+
+    results["clock.update_time"] = summarize(measure(tick, repeat))
+    results["clock.update_time_and_paint"] = summarize(measure(tick_and_paint, repeat))
+
+    flash = [0]
+
+    def flash_frame():
+        ramp = clock.flash_ramp
+        flash[0] = (flash[0] + 1) % ramp.frame_count
+        clock.set_flash_frame(ramp.colors[flash[0]])
+        app.processEvents()
+
+    results["clock.flash_frame"] = summarize(measure(flash_frame, repeat))
+    window.close()
+
+
+def bench_font_fitting(app, results, repeat):
+    from font_fitting import FontFitter
+    window = bigclock.MainWindow()
+    clock = window.clock_app
+
+    for width, height in WINDOW_SIZES:
+        def cold_fit():
+            FontFitter.clear()
+            clock.get_optimal_font_size(width, height)
+
+        results[f"font.get_optimal_font_size.cold.{width}x{height}"] = summarize(measure(cold_fit, repeat))
+        results[f"font.get_optimal_font_size.cached.{width}x{height}"] = summarize(
+            measure(lambda: clock.get_optimal_font_size(width, height), repeat)
+        )
+
+    def adjust_across_sizes():
+        FontFitter.clear()
+        for width, height in WINDOW_SIZES:
+            clock.resize(width, height)
+            clock.adjust_font_sizes()
+
+    results["font.adjust_font_sizes.cold_sweep"] = summarize(measure(adjust_across_sizes, max(repeat // 10, 5)))
+
+    # Dragging the window edge: each resize event only moves the scaled preview,
+    # the refit happens once when the resize settles
+    window.setMinimumSize(100, 50)
+    window.setMaximumSize(4000, 4000)
+    window.resize(800, 120)
+    window.show()
+    app.processEvents()
+    clock.on_resize_settled()
+    drag = [0]
+
+    def drag_step():
+        drag[0] += 1
+        window.resize(800 + (drag[0] % 50) * 7, 120 + (drag[0] % 50) * 3)
+        app.processEvents()
+
+    def release():
+        drag_step()
+        FontFitter.clear()
+        clock.on_resize_settled()
+
+    results["font.resize_drag_step"] = summarize(measure(drag_step, repeat))
+    results["font.resize_release_refit"] = summarize(measure(release, max(repeat // 4, 10)))
+    window.close()
+
+
+def bench_wiggle(app, results, repeat):
+    window = bigclock.MainWindow()
+    window.show()
+    app.processEvents()
+    window.switch_to_wiggle_flash(13)
+    wiggle = window.wiggle_flash
+    app.processEvents()
+
+    def frame():
+        wiggle.step += 1
+        wiggle.repaint()
+
+    results["wiggle.paint_frame"] = summarize(measure(frame, repeat))
+    window.switch_back_to_clock()
+    window.close()
+
+
+def bench_toggle(app, results, repeat):
+    from animated_toggle import AnimatedToggle
+    toggle = AnimatedToggle()
+    toggle.resize(80, 30)
+    toggle.show()
+    app.processEvents()
+
+    position = [0.0]
+
+    def frame():
+        position[0] = (position[0] + 0.05) % 1.0
+        toggle._handle_position = position[0]
+        toggle.repaint()
+
+    results["toggle.paint_frame"] = summarize(measure(frame, repeat))
+    toggle.close()
+
+    # Flip the 24h switch in the settings dialog and paint every frame of its animations
+    dialog = bigclock.SettingsDialog()
+    dialog.show()
+    app.processEvents()
+    switch = dialog.toggle_24h_clock
+    frame_times = range(0, switch.pulse_anim.duration() + 1, 16)
+
+    def toggle_and_animate():
+        switch.setChecked(not switch.isChecked())
+        switch.animations_group.pause()
+        for t in frame_times:
+            switch.animations_group.setCurrentTime(t)
+            switch.repaint()
+
+    samples = measure(toggle_and_animate, max(repeat // 4, 10))
+    results["toggle.settings_dialog_toggle_per_frame"] = summarize([ms / len(frame_times) for ms in samples])
+    dialog.hide()  # reject() would ask for confirmation
+    dialog.deleteLater()
+
+
+def bench_settings_dialog(app, results, repeat):
+
+    def construct():
+        dialog = bigclock.SettingsDialog()
+        dialog.deleteLater()
+
+    def construct_full():
+        dialog = bigclock.SettingsDialog()
+        dialog.finish_deferred_build()
+        dialog.deleteLater()
+
+    results["settings_dialog.construct"] = summarize(measure(construct, max(repeat // 10, 5)))
+    results["settings_dialog.construct_full"] = summarize(measure(construct_full, max(repeat // 10, 5)))
+    app.processEvents()
+
+
+def bench_screens(app, results, repeat):
+    # One tick fanned out to 1 and to 3 clock windows sharing a scheduler (one per screen)
+    from tick_scheduler import TickScheduler
+    for count in (1, 3):
+        scheduler = TickScheduler(bigclock.AppConfig())
+        windows = [bigclock.MainWindow(scheduler=scheduler, audio=i == 0) for i in range(count)]
+        for window in windows:
+            window.show()
+        # Let the deferred wiggle build and its idle-time glyph warm-up finish first
+        while any(window.wiggle_flash is None or window.wiggle_flash._warm_steps for window in windows):
+            app.processEvents()
+        settle_until = time.perf_counter() + 0.5  # and the pending resize refits
+        while time.perf_counter() < settle_until:
+            app.processEvents()
+        now = [datetime(2024, 1, 1, 12, 0, 1)]
+
+        def tick_and_paint():
+            now[0] += timedelta(seconds=1)
+            scheduler.tick.emit(now[0])
+            app.processEvents()
+
+        # A minute of warm-up ticks renders every digit cell first
+        results[f"screens.tick_and_paint.{count}x"] = summarize(measure(tick_and_paint, repeat, warmup=60))
+        for window in windows:
+            window.close()
+        scheduler.stop()
+
+
+def bench_reminders(app, results, repeat):
+    # The idle cost must not grow with the number of reminders; add/remove and firing are O(log n)
+    from reminders import Reminder, ReminderEngine
+    from tick_scheduler import TICK_SLACK_MS
+    from time_source import SimulatedClock
+    for count in (10, 1000, 10000):
+        clock = SimulatedClock(datetime(2024, 1, 1, 12, 0, 30), process_events=False)
+        engine = ReminderEngine(bigclock.AppConfig(), clock=clock)
+        # Yearly reminders, all in the second half of the year, so January is idle
+        engine.set_reminders([Reminder(f"yearly {i}", f"{i % 60} {i % 24} {1 + i % 28} {7 + i % 6} *") for i in range(count)])
+
+        def idle_hour():
+            clock.run_for(timedelta(hours=1))
+
+        def add_and_remove():
+            engine.remove(engine.add(Reminder("one-off", at=clock.now() + timedelta(days=3))))
+
+        def fire_one():
+            clock.run_for(engine.next_deadline() - clock.now() + timedelta(milliseconds=TICK_SLACK_MS))
+
+        results[f"reminders.idle_hour.{count}"] = summarize(measure(idle_hour, max(repeat // 10, 5)))
+        results[f"reminders.add_and_remove.{count}"] = summarize(measure(add_and_remove, repeat))
+        every_minute = engine.add(Reminder("every minute", "* * * * *"))
+        results[f"reminders.fire_one.{count}"] = summarize(measure(fire_one, repeat))
+        engine.remove(every_minute)
+        engine.stop()
+
+
+def write_calendar(path, count):
+    """An .ics file of count events over the last ten years, every tenth one recurring weekly."""
+    start = datetime(2014, 1, 6, 9, 0)
+    with open(path, "w", newline="") as f:
+        f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n")
+        for i in range(count):
+            t = start + timedelta(hours=3 * i)
+            f.write(
+                f"BEGIN:VEVENT\r\nUID:event-{i}\r\nSUMMARY:Meeting number {i} with a longer title th\r\n at is folded\r\n"
+                f"DTSTART;TZID=Europe/Berlin:{t:%Y%m%dT%H%M%S}\r\nDESCRIPTION:{'Agenda item. ' * 20}\r\n"
+            )
+            if i % 10 == 0:
+                f.write("RRULE:FREQ=WEEKLY;BYDAY=MO,WE,FR\r\n")
+            f.write("BEGIN:VALARM\r\nTRIGGER:-PT15M\r\nEND:VALARM\r\nEND:VEVENT\r\n")
+        f.write("END:VCALENDAR\r\n")
+
+
+def bench_calendar(app, results, repeat):
+    # Parsing streams the file; a restart with an unchanged file only loads the index, and
+    # the hourly refresh of unchanged files is a stat() per calendar plus the window's occurrences.
+    # Both run on the feed's worker thread; the GUI thread only applies the changed reminders.
+    import tracemalloc
+    from calendar_feed import CalendarFeed, CalendarIndex, read_events
+    from reminders import ReminderEngine
+    directory = pathlib.Path(tempfile.mkdtemp())
+    path = directory / "calendar.ics"
+    write_calendar(path, 30000)  # about 14 MB
+    now = datetime(2024, 1, 3, 8, 0)
+
+    results["calendar.parse_cold"] = summarize(measure(lambda: read_events(path, now), 3, warmup=1))
+    tracemalloc.start()
+    read_events(path, now)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    results["calendar.parse_cold_peak_mb"] = {"n": 1, "mean_ms": peak, "p99_ms": peak}  # MB, not ms
+
+    index_path = directory / "calendar_index.json"
+    index = CalendarIndex(index_path)
+    index.events(path, now)
+    index.store.flush()
+    results["calendar.index_load_warm"] = summarize(
+        measure(lambda: CalendarIndex(index_path).events(path, now), max(repeat // 20, 5), warmup=1)
+    )
+
+    config = bigclock.AppConfig()
+    config.calendars = [str(path)]
+    engine = ReminderEngine(config)
+    feed = CalendarFeed(config, engine, index_path, clock=engine.clock)
+    expanded = []
+    feed._expanded.connect(expanded.append)
+
+    def wait_for_worker(count):
+        while len(expanded) == count:
+            app.processEvents()
+
+    def refresh():
+        count = len(expanded)
+        feed.refresh()
+        wait_for_worker(count)
+
+    feed.start()
+    wait_for_worker(0)
+    # Worker and GUI thread together, then the GUI thread's share: the first load and an hourly refresh
+    results["calendar.refresh"] = summarize(measure(refresh, max(repeat // 10, 5)))
+    wanted = expanded[-1]
+    first_load = []
+    for _ in range(max(repeat // 10, 5)):
+        engine.set_reminders([])
+        feed._reminder_ids = {}
+        start = time.perf_counter()
+        feed._apply(wanted)
+        first_load.append((time.perf_counter() - start) * 1000)
+    results["calendar.apply_first_load"] = summarize(first_load)
+    results["calendar.apply_unchanged"] = summarize(measure(lambda: feed._apply(wanted), repeat))
+    feed.timer.stop()
+    engine.stop()
+
+
+BENCHMARKS = {
+    "clock": bench_clock,
+    "font": bench_font_fitting,
+    "wiggle": bench_wiggle,
+    "toggle": bench_toggle,
+    "settings": bench_settings_dialog,
+    "screens": bench_screens,
+    "reminders": bench_reminders,
+    "calendar": bench_calendar,
+}
+
+
+def compare(previous, current):
+    """Print the relative change of each benchmark's mean and p99 against a previous run."""
+    for name, result in current["results"].items():
+        before = previous["results"].get(name)
+        if before is None:
+            continue
+        mean_change = (result["mean_ms"] - before["mean_ms"]) / max(before["mean_ms"], 1e-9)
+        p99_change = (result["p99_ms"] - before["p99_ms"]) / max(before["p99_ms"], 1e-9)
+        print(f"{name:<52} mean {mean_change:+7.1%}   p99 {p99_change:+7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="timed iterations per benchmark")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="run a subset of the benchmarks")
+    parser.add_argument("--output", type=pathlib.Path, help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", type=pathlib.Path, help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    results = {}
+    for name in args.only or BENCHMARKS:
+        BENCHMARKS[name](app, results, args.repeat)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "qpa": os.environ["QT_QPA_PLATFORM"],
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), report)
+
+
+if __name__ == "__main__":
+    main()
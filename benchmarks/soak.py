@@ -0,0 +1,150 @@
+"""
+Fast-forward soak test of the clock's scheduling.
+
+Builds the main window offscreen on a SimulatedClock and runs whole days of ticks,
+flashes and hourly announcements in seconds. Every event is checked against the
+wall-clock boundary it belongs to, and the event counts and CPU time per simulated day
+are reported as JSON. Exits with status 1 if any scheduling check fails.
+
+    python benchmarks/soak.py --days 1
+    python benchmarks/soak.py --days 30 --no-paint
+"""
+import argparse
+import json
+import os
+import pathlib
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Keep the user's saved settings out of the run
+os.environ["ADHD_CLOCK_CONFIG"] = str(pathlib.Path(tempfile.mkdtemp()) / "settings.json")
+
+from PyQt5.QtCore import QEvent, QObject  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+from tick_scheduler import TICK_SLACK_MS  # noqa: E402
+
+
+class PaintCounter(QObject):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            self.count += 1
+        return False
+
+
+def expected_events(start, end, regularity):
+    """Count the hour and flash boundaries strictly after start whose wakeup lands before end."""
+    hours = flashes = 0
+    boundary = start.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    while boundary + timedelta(milliseconds=TICK_SLACK_MS) <= end:
+        if boundary.minute == 0:
+            hours += 1
+        elif boundary.minute % regularity == 0:
+            flashes += 1  # minute 0 belongs to the hourly switch
+        boundary += timedelta(minutes=1)
+    return hours, flashes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=float, default=1.0, help="simulated days to run")
+    parser.add_argument("--start", type=datetime.fromisoformat, default=datetime(2024, 1, 1),
+                        help="simulated start time (ISO format)")
+    parser.add_argument("--regularity", type=int, default=15, help="flash_regularity in minutes")
+    parser.add_argument("--no-paint", action="store_true", help="skip Qt event processing (scheduling only)")
+    args = parser.parse_args()
+
+    # bigclock sets the HiDPI attribute at import, which has to happen before the QApplication exists
+    import bigclock
+    from bigclock import WIGGLE_DURATION_MS
+    from time_source import SimulatedClock
+    app = QApplication(sys.argv[:1])
+
+    config = bigclock.AppConfig()
+    config.flash_regularity = args.regularity
+    clock = SimulatedClock(start=args.start, process_events=not args.no_paint)
+    window = bigclock.MainWindow(clock=clock)
+    window.show()
+    app.processEvents()
+    window.ensure_wiggle_flash()
+    clock_app = window.clock_app
+
+    counts = {"ticks": 0, "flashes": 0, "hours": 0, "flash_frames": 0, "wiggle_frames": 0}
+    errors = []
+    last_tick = [None]
+
+    def on_tick(now):
+        counts["ticks"] += 1
+        previous, last_tick[0] = last_tick[0], now
+        if now.microsecond >= 100_000:
+            errors.append(f"tick at {now} is {now.microsecond // 1000} ms past the second")
+        gap = now.replace(microsecond=0) - previous.replace(microsecond=0) if previous else timedelta(seconds=1)
+        # Ticks only pause while the hourly announcement covers the clock
+        resumed_after_announcement = now.minute == 0 and now.second <= WIGGLE_DURATION_MS // 1000 + 1
+        if gap != timedelta(seconds=1) and not resumed_after_announcement:
+            errors.append(f"tick gap from {previous} to {now}")
+
+    def on_flash():
+        counts["flashes"] += 1
+        now = clock.now()
+        if now.second != 0 or now.minute % args.regularity or now.minute == 0:
+            errors.append(f"flash at {now}")
+
+    def on_hour(hour):
+        counts["hours"] += 1
+        now = clock.now()
+        if now.minute != 0 or now.second != 0 or hour != now.hour:
+            errors.append(f"hour {hour} announced at {now}")
+
+    def on_flash_frame(_):
+        counts["flash_frames"] += 1
+
+    def on_wiggle_frame():
+        counts["wiggle_frames"] += 1
+
+    clock_app.scheduler.tick.connect(on_tick)
+    clock_app.scheduler.flash_due.connect(on_flash)
+    clock_app.scheduler.hour_reached.connect(on_hour)
+    clock_app.flash_engine.frame.connect(on_flash_frame)
+    window.wiggle_flash.timer.timeout.connect(on_wiggle_frame)
+    paints = PaintCounter()
+    for widget in (clock_app, clock_app.time_label, clock_app.date_label, window.wiggle_flash):
+        widget.installEventFilter(paints)
+
+    duration = timedelta(days=args.days)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    clock.run_for(duration)
+    cpu_s, wall_s = time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+    hours, flashes = expected_events(args.start, args.start + duration, args.regularity)
+    if counts["hours"] != hours:
+        errors.append(f"{counts['hours']} hourly announcements, expected {hours}")
+    if counts["flashes"] != flashes:
+        errors.append(f"{counts['flashes']} flashes, expected {flashes}")
+
+    report = {
+        "simulated_days": args.days,
+        "start": args.start.isoformat(),
+        "flash_regularity": args.regularity,
+        "painting": not args.no_paint,
+        "counts": dict(counts, paints=paints.count),
+        "cpu_s": cpu_s,
+        "cpu_s_per_day": cpu_s / args.days,
+        "wall_s": wall_s,
+        "errors": errors[:20],
+        "error_count": len(errors),
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,41 @@
 import sys
+import argparse
 import logging
 import os
+import math
 import random
 import pathlib
-from datetime import datetime
+import time
+from datetime import timedelta
+from startup_profile import StartupProfiler  # imported before Qt so the import time is measured
 from PyQt5.QtWidgets import (
-    QApplication, QWidget, QLabel, QPushButton, QDesktopWidget,
+    QApplication, QWidget, QLabel, QPushButton,
     QVBoxLayout, QHBoxLayout, QSizePolicy, QStackedLayout, QLayout,
     QSlider, QGroupBox, QLineEdit, QDialog, QDialogButtonBox, QFileDialog, 
-    QColorDialog,QDoubleSpinBox, QStyle, QToolButton,QComboBox, QMessageBox
+    QColorDialog,QDoubleSpinBox, QStyle, QToolButton,QComboBox, QMessageBox, QWIDGETSIZE_MAX
 )
 from PyQt5.QtCore import (
-    QTimer, Qt, QBasicTimer, QPropertyAnimation, QEasingCurve, QEvent,
-    pyqtProperty, QUrl, QCoreApplication, QSize, QPoint, pyqtSignal
+    QTimer, Qt, QObject, QEasingCurve, QEvent,
+    pyqtProperty, QCoreApplication, QSize, QPoint, QRect, pyqtSignal
 )
 from PyQt5.QtGui import (
-    QFont, QFontDatabase, QPainter, QColor, QPalette, QFontMetrics
+    QFont, QFontDatabase, QPainter, QColor, QPalette
 )
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QSoundEffect
 from animated_toggle import AnimatedToggle
+from tick_scheduler import TickScheduler, DEFAULT_MISSED_EVENT_POLICY
+from font_fitting import FontFitter
+from config_store import ConfigStore
+from glyph_atlas import GlyphAtlas, HUE_STEPS
+from clock_face import ClockFace, ClockFormatter, ScaledPreview, widest_digit
+from flash_engine import FlashEngine, FlashRamp
+from time_source import SystemClock
+from instrumentation import Instrumentation, LOG_INTERVAL_MS
+from screen_manager import ScreenManager
+from reminders import ReminderEngine
+from calendar_feed import CalendarFeed
+# QtMultimedia (audio_engine, sound_pool) is imported on first use to keep it off the startup path
+
+StartupProfiler().mark("imports")
 
 
 # ----------------------------------------------
@@ -27,6 +44,14 @@ QCoreApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
 # Configuration Constants - uncustomizable
 BUTTON_TEXT_COLOR = "white"
 WIGGLE_BACKGROUND_COLOR = QColor(244, 246, 243)  # White
+WIGGLE_FONT_SIZE = 180  # point size of the hourly announcement
+WIGGLE_FRAME_MS = 60  # the wiggle phase advances one sine-table step every this many ms
+WIGGLE_PAINT_SHARE = 0.5  # skip wiggle steps rather than spend more than this share of the time painting
+DEFAULT_REFRESH_HZ = 60
+WIGGLE_DURATION_MS = 8000  # announcement length; the audio clip is 7.5 seconds long
+OVERLAY_REFRESH_MS = 1000  # timing overlay update interval
+RESIZE_SETTLE_MS = 100  # refit the fonts once resize events have stopped for this long
+FIT_MEMO_SIZE = 32  # window sizes whose font fits are remembered
 
 # buttons in the settings dialog
 BUTTON_COLORS = [QColor(100, 255, 55), QColor(255, 50, 50)] # first is ACCEPT = GREEN , second is CANCEL = RED
@@ -59,15 +84,47 @@ WINDOW_AMT_OCCUPIED=0.15 # the window will occupy this amount of the screen heig
 
 DEFAULT_RELATIVE_SIZE_TIME_VS_DATE = 12 # this means the time will be 9x the size of the date
 
+# Settings are saved here whenever they change; override with the ADHD_CLOCK_CONFIG environment variable
+CONFIG_PATH = pathlib.Path(
+    os.environ.get("ADHD_CLOCK_CONFIG", pathlib.Path.home() / ".config" / "adhd_clock" / "settings.json")
+)
+# The parsed .ics calendars are cached next to the settings
+CALENDAR_INDEX_PATH = CONFIG_PATH.parent / "calendar_index.json"
+DEFAULT_CALENDAR_LEAD_MINUTES = 5  # calendar events flash this long before they start
+
 # --------------------------------------------------
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
+class ConfigSignals(QObject):
+    """Typed change notifications for AppConfig, one signal per setting."""
+    toggle_24h_changed = pyqtSignal(bool)
+    flash_duration_changed = pyqtSignal(float)
+    flash_regularity_changed = pyqtSignal(int)
+    audio_path_changed = pyqtSignal(str)
+    volume_level_changed = pyqtSignal(float)
+    background_color_changed = pyqtSignal(QColor)
+    flash_color_changed = pyqtSignal(QColor)
+    clock_text_color_changed = pyqtSignal(QColor)
+    toolbar_color_changed = pyqtSignal(QColor)
+    relativeFontSize_changed = pyqtSignal(float)
+    missed_event_policy_changed = pyqtSignal(str)
+    reminders_changed = pyqtSignal(list)
+    calendars_changed = pyqtSignal(list)
+    calendar_lead_minutes_changed = pyqtSignal(int)
+
 class AppConfig:
     """Singleton class to manage application configuration settings."""
     _instance = None
 
+    # Settings written to CONFIG_PATH; QColor values are stored as "#rrggbb"
+    PERSISTED_SETTINGS = (
+        "toggle_24h", "flash_duration", "flash_regularity", "audio_path", "volume_level",
+        "background_color", "flash_color", "clock_text_color", "toolbar_color", "relativeFontSize",
+        "missed_event_policy", "reminders", "calendars", "calendar_lead_minutes",
+    )
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -86,15 +143,79 @@ class AppConfig:
         self.clock_text_color = DEFAULT_CLOCK_TEXT_COLOR
         self.toolbar_color = DEFAULT_TOOLBAR_COLOR
         self.relativeFontSize = DEFAULT_RELATIVE_SIZE_TIME_VS_DATE
+        self.missed_event_policy = DEFAULT_MISSED_EVENT_POLICY  # fire_once, coalesce or skip
+        self.reminders = []  # dicts, see reminders.Reminder.from_dict
+        self.calendars = []  # paths of .ics files
+        self.calendar_lead_minutes = DEFAULT_CALENDAR_LEAD_MINUTES
+
+        # Subscribers connect to self.signals.<setting>_changed to redo only their own work
+        self.signals = ConfigSignals()
+
+        # Saved settings override the defaults
+        self.store = ConfigStore(CONFIG_PATH)
+        self.loaded_from_disk = self.load()
+
+    def load(self):
+        """Apply the settings saved on disk. Returns False if there were none."""
+        start = time.perf_counter()
+        data = self.store.load()
+        if data is None:
+            return False
+        for key in self.PERSISTED_SETTINGS:
+            if key not in data:
+                continue
+            default = getattr(self, key)
+            value = data[key]
+            if isinstance(default, QColor):
+                value = QColor(value)
+                if not value.isValid():
+                    continue
+            elif not self._same_kind(value, default):
+                logging.warning(f"Ignoring saved setting {key}={value!r}")
+                continue
+            setattr(self, key, value)
+        logging.info(f"Loaded settings from {self.store.path} in {(time.perf_counter() - start) * 1000:.2f} ms")
+        return True
+
+    @staticmethod
+    def _same_kind(value, default):
+        """Check a loaded value against the default's type; ints and floats are interchangeable."""
+        if isinstance(default, bool) or isinstance(value, bool):
+            return isinstance(value, bool) and isinstance(default, bool)
+        if isinstance(default, (int, float)):
+            return isinstance(value, (int, float))
+        return isinstance(value, type(default))
+
+    def to_dict(self):
+        """Return the persisted settings in their on-disk form."""
+        data = {}
+        for key in self.PERSISTED_SETTINGS:
+            value = getattr(self, key)
+            data[key] = value.name() if isinstance(value, QColor) else value
+        return data
 
     def update_setting(self, key, value):
-        """Update a setting."""
+        """Update a setting, queue it to be saved and notify its subscribers. No-op if unchanged."""
+        if getattr(self, key) == value:
+            return
         setattr(self, key, value)
+        self.store.schedule_save(self.to_dict())
+        getattr(self.signals, f"{key}_changed").emit(value)
 # --------------------------------------------------
 
 class SettingsDialog(QDialog):
+    """
+    Settings dialog shown at startup and from the clock's title bar.
+
+    Only the frame and primary controls are built in the constructor. Slower parts
+    (beep sounds, the flash interval list, color swatches) are added one step per event
+    loop turn after the dialog is on screen, so it appears immediately.
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._build_started = time.perf_counter()
+        self._first_paint_reported = False
         self.setWindowTitle("ADHD Clock Settings")
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
 
@@ -106,12 +227,51 @@ class SettingsDialog(QDialog):
 
         # create a dictionary to store the colors of the buttons
         self.color_buttons = {}
+        # colors picked in this dialog, applied to the config on accept
+        self.pending_colors = {}
         
         # Initialize the sound effect for volume feedback
         self.init_sound_effect()
         
         # UI Elements
-        self.init_ui()
+        with StartupProfiler().span("dialog-build"):
+            self.init_ui()
+
+        # Expensive sections are built incrementally once the dialog has painted its first frame
+        self._deferred_steps = [
+            lambda: self.update_flash_regularity_options(60),  # Populate with divisors of 60
+            self.load_sound_effects,
+        ] + [
+            lambda args=args: self.create_color_picker(self.color_layout, *args)
+            for args in (
+                ("Background Color", self.config.background_color, "background_color"),
+                ("Flash Color", self.config.flash_color, "flash_color"),
+                ("Clock Text Color", self.config.clock_text_color, "clock_text_color"),
+                ("Toolbar Color", self.config.toolbar_color, "toolbar_color"),
+            )
+        ]
+
+    def _run_deferred_step(self):
+        """Build one deferred section, then yield back to the event loop."""
+        if self._deferred_steps:
+            self._deferred_steps.pop(0)()
+        if self._deferred_steps:
+            QTimer.singleShot(0, self._run_deferred_step)
+        else:
+            logging.info(f"Settings dialog fully built after {(time.perf_counter() - self._build_started) * 1000:.1f} ms")
+
+    def finish_deferred_build(self):
+        """Build whatever is still pending right away, before anything reads those widgets."""
+        while self._deferred_steps:
+            self._deferred_steps.pop(0)()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint_reported:
+            self._first_paint_reported = True
+            StartupProfiler().mark("dialog-visible")
+            logging.info(f"Settings dialog visible after {(time.perf_counter() - self._build_started) * 1000:.1f} ms")
+            QTimer.singleShot(0, self._run_deferred_step)
 
     def init_ui(self):
         """Set up the settings dialog UI."""
@@ -132,8 +292,7 @@ class SettingsDialog(QDialog):
         # Flash Regularity Input (replaced QSpinBox with QComboBox)
         flash_layout.addWidget(QLabel("Flash Regularity (minutes)"))
         self.flash_regularity_combo = QComboBox(self)
-        self.update_flash_regularity_options(60)  # Populate with divisors of 60
-        self.flash_regularity_combo.setCurrentText(str(self.config.flash_regularity))  # Set initial value
+        self.flash_regularity_combo.addItem(str(self.config.flash_regularity))  # Full list is filled in later
         flash_layout.addWidget(self.flash_regularity_combo)
 
         flash_group.setLayout(flash_layout)
@@ -182,21 +341,9 @@ class SettingsDialog(QDialog):
 
         # Color Settings Group
         color_group = QGroupBox("Color Settings")
-        color_layout = QVBoxLayout()
-
-        # Background Color
-        self.create_color_picker(color_layout, "Background Color", self.config.background_color, "background_color")
-
-        # Flash Color
-        self.create_color_picker(color_layout, "Flash Color", self.config.flash_color, "flash_color")
-
-        # Clock Text Color
-        self.create_color_picker(color_layout, "Clock Text Color", self.config.clock_text_color, "clock_text_color")
-
-        # Toolbar Color
-        self.create_color_picker(color_layout, "Toolbar Color", self.config.toolbar_color, "toolbar_color")
-
-        color_group.setLayout(color_layout)
+        # The color pickers are added by the deferred build steps
+        self.color_layout = QVBoxLayout()
+        color_group.setLayout(self.color_layout)
         main_layout.addWidget(color_group)
 
         # Restore Defaults Button
@@ -214,20 +361,27 @@ class SettingsDialog(QDialog):
     def update_flash_regularity_options(self, number):
         """Populate the combo box with divisors of the given number."""
         divisors = [i for i in range(1, number + 1) if number % i == 0]  # Divisors of 60
+        current = self.flash_regularity_combo.currentText()
         self.flash_regularity_combo.clear()  # Clear existing items
         self.flash_regularity_combo.addItems([str(d) for d in divisors]) 
+        self.flash_regularity_combo.setCurrentText(current)
 
     def restore_defaults(self):
         """Restore settings to default values."""
+        self.finish_deferred_build()
         self.flash_duration_input.setValue(DEFAULT_FLASH_DURATION)
         self.flash_regularity_combo.setCurrentText(str(DEFAULT_FLASH_REGULARITY))  # Update this line
         self.audio_input.setText(str(DEFAULT_AUDIO_PATH))
         self.volume_slider.setValue(int(DEFAULT_VOLUME_LEVEL * 100))
         self.toggle_24h_clock.setChecked(True)
-        self.set_color_button(self.color_buttons['background_color'], DEFAULT_BACKGROUND_COLOR)
-        self.set_color_button(self.color_buttons['flash_color'], DEFAULT_FLASH_COLOR)
-        self.set_color_button(self.color_buttons['clock_text_color'], DEFAULT_CLOCK_TEXT_COLOR)
-        self.set_color_button(self.color_buttons['toolbar_color'], DEFAULT_TOOLBAR_COLOR)
+        for attribute_name, color in (
+            ('background_color', DEFAULT_BACKGROUND_COLOR),
+            ('flash_color', DEFAULT_FLASH_COLOR),
+            ('clock_text_color', DEFAULT_CLOCK_TEXT_COLOR),
+            ('toolbar_color', DEFAULT_TOOLBAR_COLOR),
+        ):
+            self.set_color_button(self.color_buttons[attribute_name], color)
+            self.pending_colors[attribute_name] = color
 
 
     def update_volume_label(self, value):
@@ -235,33 +389,14 @@ class SettingsDialog(QDialog):
         self.volume_label.setText(f"{value}%")    
     
     def init_sound_effect(self):
-        """Dynamically load all .wav files from the resources directory for volume slider feedback."""
-        
-        # Path to the resources directory
-        resources_dir = pathlib.Path(resource_path('resources'))
-        
-        # List of beep sound files (only .wav files)
-        self.beep_paths = list(resources_dir.glob('*.wav'))
-
-        # Clear the sound effects list before loading
+        """Set up the volume slider feedback; the beeps themselves are loaded by load_sound_effects."""
+        self.sound_pool = None  # created with the sounds, which pulls in QtMultimedia
         self.sound_effects = []
 
-        # Preload all .wav files as QSoundEffect
-        for path in self.beep_paths:
-            sound = QSoundEffect()
-            if path.exists():
-                sound.setSource(QUrl.fromLocalFile(str(path)))
-                sound.setLoopCount(1)  # Play the beep once per trigger
-                sound.setVolume(self.config.volume_level)  # Initial volume
-                self.sound_effects.append(sound)
-
-            else:
-                logging.error(f"Beep sound file not found: {path}")
-
         # Initialize a timer to debounce slider movements
         self.beep_timer = QTimer()
         self.beep_timer.setSingleShot(True)
-        self.beep_timer.timeout.connect(self.play_beep)
+        self.beep_timer.timeout.connect(self.play_random_beep)
         
         # Timer to reset the sound effect after 15 seconds
         self.reset_sound_timer = QTimer()
@@ -271,12 +406,22 @@ class SettingsDialog(QDialog):
         # Track the last played sound
         self.current_beep_sound = None
 
+    def load_sound_effects(self):
+        """Dynamically load all .wav files from the resources directory for volume slider feedback."""
+        try:
+            from sound_pool import SoundPool
+        except ImportError as e:
+            logging.warning(f"QtMultimedia unavailable, volume feedback disabled: {e}")
+            return
+        # The pool loads every beep once per process, so reopening the dialog does no file I/O
+        self.sound_pool = SoundPool()
+        self.sound_effects = self.sound_pool.load_directory(RESOURCE_PATH, '*.wav')
+
     def play_beep(self):
         """Play the currently active beep sound."""
-        if self.current_beep_sound:
-            self.current_beep_sound.setVolume(self.current_volume)
-            self.current_beep_sound.stop()  # Stop any currently playing beep to prevent overlap
-            self.current_beep_sound.play()
+        if self.current_beep_sound and self.sound_pool is not None:
+            # Pooled voices let quick slider moves overlap instead of clipping each other
+            self.sound_pool.play(self.current_beep_sound, self.current_volume)
 
     def play_random_beep(self):
         """Select and play a new random beep sound, locking it for 15 seconds."""
@@ -317,17 +462,16 @@ class SettingsDialog(QDialog):
         button.update()
 
     def choose_color(self, button, attribute_name):
-        current_color = getattr(self.config, attribute_name)
+        current_color = self.pending_colors.get(attribute_name, getattr(self.config, attribute_name))
         color = QColorDialog.getColor(current_color, self, f"Select {attribute_name.replace('_', ' ').title()} Color")
         if color.isValid():
             self.set_color_button(button, color)
-            setattr(self.config, attribute_name, color)
+            self.pending_colors[attribute_name] = color
             
     def browse_audio(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Select Audio File", "", "Audio Files (*.mp3 *.wav)")
         if file_path:
             self.audio_input.setText(file_path)
-            self.config.audio_path = file_path
     
     def debounce_play_beep(self, value):
         """Start or restart the beep timer on slider value change."""
@@ -336,12 +480,18 @@ class SettingsDialog(QDialog):
         
     def accept(self):
         """Save the settings when 'Ok' is pressed."""
+        self.finish_deferred_build()
         self.config.update_setting('flash_duration', self.flash_duration_input.value())
         self.config.update_setting('flash_regularity', int(self.flash_regularity_combo.currentText()))
         self.config.update_setting('audio_path', self.audio_input.text())
         self.config.update_setting('volume_level', self.volume_slider.value() / 100.0)
         self.config.update_setting('toggle_24h', self.toggle_24h_clock.isChecked())
-        # Colors are already updated in choose_color
+        for attribute_name, color in self.pending_colors.items():
+            self.config.update_setting(attribute_name, color)
+        # Only the settings that actually changed notify their subscribers, but the file is
+        # always written (off the GUI thread, or on quit at the latest): accepting the
+        # defaults on first launch still counts as saved settings
+        self.config.store.schedule_save(self.config.to_dict())
         super().accept()
             
     def reject(self):
@@ -358,8 +508,8 @@ class SettingsDialog(QDialog):
 
     def move_to_primary_screen(self):
         """Move the dialog to the primary (main) screen."""
-        desktop = QDesktopWidget()
-        primary_screen_geometry = desktop.screenGeometry(0)  # Get the primary screen (screen 0)
+        screens = ScreenManager()
+        primary_screen_geometry = screens.geometry(screens.primary_screen())
         dialog_width = self.width()
         dialog_height = self.height()
         # Center the dialog on the primary screen
@@ -399,23 +549,45 @@ class MainWindow(QWidget):
     active, but only one is visible at a time by way of the QStackedLayout. 
     """
 
-    def __init__(self):
+    first_frame = pyqtSignal()  # emitted once, when the clock has painted for the first time
+
+    def __init__(self, clock=None, scheduler=None, reminders=None, screen=None, audio=True):
         super().__init__()
         self.config = AppConfig()
+        # Source of time and timers for the whole window; a SimulatedClock fast-forwards it
+        self.clock = clock or SystemClock()
+        # Screen this window belongs to (see ClockGroup); None follows ScreenManager.clock_screen()
+        self.target_screen = screen
+        # Whether this window plays the hourly clip; with several windows only one does
+        self.plays_audio = audio
         
         self.stacked_layout = QStackedLayout()
 
-        # Initialize clock and wiggle flash widgets
-        self.clock_app = BigClockApp(self)
-        self.wiggle_flash = WiggleFlash(self)
+        # Initialize the clock; the wiggle flash (and its audio) is built after the first frame
+        self.clock_app = BigClockApp(self, clock=self.clock, scheduler=scheduler, reminders=reminders)
+        self.wiggle_flash = None
+
+        # Ends the hourly announcement; restarted rather than stacked if hours arrive back to back
+        self.wiggle_timer = self.clock.create_timer(self)
+        self.wiggle_timer.setSingleShot(True)
+        self.wiggle_timer.timeout.connect(self.switch_back_to_clock)
+
+        # Periodic compact timing summary, only when running with --instrument/--overlay;
+        # windows sharing a scheduler leave it to its owner
+        if Instrumentation().enabled and scheduler is None:
+            self.instrumentation_timer = self.clock.create_timer(self)
+            self.instrumentation_timer.timeout.connect(Instrumentation().log_summary)
+            self.instrumentation_timer.start(LOG_INTERVAL_MS)
 
         # Set up the stacked layout
         self.stacked_layout.addWidget(self.clock_app)
-        self.stacked_layout.addWidget(self.wiggle_flash)
 
         # Set up the main layout
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
+        # The clock refits to whatever size the screen gives it; its current fonts must not
+        # hold the window at the old size when it moves to a smaller screen
+        main_layout.setSizeConstraint(QLayout.SetNoConstraint)
         main_layout.addLayout(self.stacked_layout)
         self.stacked_layout.setCurrentWidget(self.clock_app)
         self.setLayout(main_layout)
@@ -426,57 +598,79 @@ class MainWindow(QWidget):
         # self.wiggle_flash.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         # self.adjustSize()
         
-        # Move the application to the extended monitor
+        # Move the application to the extended monitor, and again whenever the screens change
         self.move_to_extended_monitor()
+        ScreenManager().signals.screens_changed.connect(self.move_to_extended_monitor)
         
+    def ensure_wiggle_flash(self):
+        """Build the WiggleFlash widget on first use."""
+        if self.wiggle_flash is None:
+            with StartupProfiler().span("wiggle-build"):
+                self.wiggle_flash = WiggleFlash(self, clock=self.clock, audio=self.plays_audio)
+                self.stacked_layout.addWidget(self.wiggle_flash)
+        return self.wiggle_flash
+
+    def enable_audio(self):
+        """Make this window the one that plays the hourly clip."""
+        self.plays_audio = True
+        if self.wiggle_flash is not None:
+            self.wiggle_flash.enable_audio()
+
+    def on_first_frame(self):
+        """Called once the clock has painted; the deferred subsystems are built when idle."""
+        self.first_frame.emit()
+        self.clock.single_shot(0, self.ensure_wiggle_flash)
+
     def switch_to_wiggle_flash(self, hour):
         """Switch to the WiggleFlash screen for an hour change."""
-        self.wiggle_flash.set_hour(hour)
-        self.stacked_layout.setCurrentIndex(1)
+        self.ensure_wiggle_flash().set_hour(hour)
+        self.show_wiggle_flash()
+
+    def show_announcement(self, text):
+        """Switch to the WiggleFlash screen to announce text, e.g. a calendar event that is starting."""
+        self.ensure_wiggle_flash().set_text(text)
+        self.show_wiggle_flash()
+
+    def show_wiggle_flash(self):
+        self.stacked_layout.setCurrentWidget(self.wiggle_flash)
         self.wiggle_flash.update()
-        QTimer.singleShot(8000, self.switch_back_to_clock) # this is set as is mostly because the audio clip is 7.5 seconds long
+        self.wiggle_timer.start(WIGGLE_DURATION_MS)
 
     def switch_back_to_clock(self):
         """Switch back to the clock display."""
         self.stacked_layout.setCurrentWidget(self.clock_app)
         
     def move_to_extended_monitor(self):
-        """Move the window to the extended monitor if available."""
-        desktop = QDesktopWidget()
-        screen_count = desktop.screenCount()
-        # logging.info(f"Detected {screen_count} screens.")
-        if screen_count > 1:
-            extended_screen = desktop.screenGeometry(1)
-            self.setGeometry(extended_screen)
-
-        elif screen_count == 1:
-            # Only the main monitor is available
-            main_screen = desktop.screenGeometry(0)
-            window_height = int(main_screen.height() * WINDOW_AMT_OCCUPIED)
-            self.setGeometry(
-                0,
-                main_screen.height() - window_height,
-                main_screen.width(),
-                window_height
-            )
-        else:
+        """
+        Move the window to the extended monitor if available, or to a strip along the
+        bottom of the main monitor. Called again in place whenever screens are plugged,
+        unplugged or change geometry; the clock refits through its resize handling.
+        """
+        screens = ScreenManager()
+        if self.target_screen is not None and self.target_screen not in screens.screens():
+            return  # unplugged; the ClockGroup closes this window
+        geometry = screens.clock_geometry(WINDOW_AMT_OCCUPIED, self.target_screen)
+        if geometry is None:
             logging.error("No screens detected. Exiting application.")
-        
+            return
+        if geometry == self.geometry():
+            return
+
+        # Lift the fixed size so the window can take the new geometry, then lock it again
+        self.setMinimumSize(0, 0)
+        self.setMaximumSize(QWIDGETSIZE_MAX, QWIDGETSIZE_MAX)
+        self.setGeometry(geometry)
         self.setFixedSize(self.size())
             
-    def update_audio_volume(self):
-        self.wiggle_flash.player.setVolume(int(self.config.volume_level * 100))
-            
 
     def allow_resize_briefly(self):
         """Allow the user to resize the window for a short period."""
         # logging.info("Temporarily allowing resizing of the window.")
-        screen = QApplication.primaryScreen()
-        desk_rect = screen.availableGeometry()
+        desk_rect = ScreenManager().available_geometry(self.screen())
         # Remove fixed size constraints
         self.setMinimumSize(QSize(400, 200))  # Set a reasonable minimum size
         self.setMaximumSize(desk_rect.size()) 
-        QTimer.singleShot(10000, self.reset_fixed_size)  # Re-lock after 10 seconds
+        self.clock.single_shot(10000, self.reset_fixed_size)  # Re-lock after 10 seconds
 
     def reset_fixed_size(self):
         """Re-lock the window size to fixed dimensions."""
@@ -489,48 +683,77 @@ class BigClockApp(QWidget):
     """A big clock application with a customizable display."""
     
     flashColorChanged = pyqtSignal()
+
+    _clock_font = None  # loaded once per process and shared by every clock window
     
-    def __init__(self, main_window, parent=None):
+    def __init__(self, main_window, parent=None, clock=None, scheduler=None, reminders=None):
         super().__init__(parent)
         self.main_window = main_window
         self.config = AppConfig()
+        self.clock = clock or SystemClock()
+        self.instruments = Instrumentation()
         
         self.title_bar = CustomTitleBar(self)
-        self.title_bar.set_toolbar_color(self.config.toolbar_color)
         self.installEventFilter(self)
         
-        # Set up timer for updating time
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_time)
-        self.timer.start(250)  # Update every so often
+        # Deadline-driven ticks replace polling: one wakeup per second plus one per event.
+        # Windows on several screens share one scheduler, owned and started by their ClockGroup
+        self.owns_scheduler = scheduler is None
+        if self.owns_scheduler:
+            scheduler = TickScheduler(self.config, self, clock=self.clock)
+            self.config.signals.flash_regularity_changed.connect(scheduler.reschedule)
+        self.scheduler = scheduler
+        self.scheduler.tick.connect(self.update_time)
+        self.scheduler.flash_due.connect(self.start_flash)
+        self.scheduler.hour_reached.connect(self.on_hour_reached)
+
+        # Reminders from the settings file and the calendars; only their nearest deadline is
+        # ever armed. The calendars are first read once the clock has painted.
+        self.calendars = None
+        if reminders is None:
+            reminders = create_reminder_engine(self.config, self.scheduler, self, clock=self.clock)
+            self.calendars = create_calendar_feed(self.config, reminders, self.scheduler, clock=self.clock)
+            main_window.first_frame.connect(self.calendars.start)
+        self.reminders = reminders
+        self.reminders.reminder_due.connect(self.start_reminder)
 
-        # Set up timer for flashing
-        self.flash_timer = QTimer(self)
-        self.flash_timer.timeout.connect(self.stop_flash)
 
         # Initialize flash color
         self._flash_color = QColor(self.config.background_color)
             
-        # Parse configs set by user and determine the number of flashes and their duration
-        self.determine_flash_length() # saves values as self.numFlashes and self.flashDur
-        
-        # Configure flash animation
-        self.flash_animation = QPropertyAnimation(self, b"flash_color")
-        self.flash_animation.setDuration(self.flashDur)  # 500ms ish
-        self.flash_animation.setLoopCount(self.numFlashes)  # Even number of flashes
-        self.flash_animation.setStartValue(self.config.background_color)
-        self.flash_animation.setEndValue(self.config.flash_color)
-        self.flash_animation.setEasingCurve(QEasingCurve.InOutQuad)
+        # Configure flash animation: a precomputed color ramp played on a frame clock
+        self.flash_easing = QEasingCurve.InOutQuad
+        self.flash_engine = FlashEngine(self, clock=self.clock)
+        self.flash_engine.frame.connect(self.set_flash_frame)
+        self.flash_engine.finished.connect(self.stop_flash)
+        self.update_flash_animation()
+
+        self._first_frame_painted = False
 
         # flag to prevent recursive font size adjustment
         self.is_adjusting_font = False 
         self.font_adjust_start_time = None
-        
+        self._fits = {}  # label name -> point size of its last fit, to predict the next one from
+        self._fit_memo = {}  # (family, 24h, ratio, width, height) -> (date size, time size), per screen size seen
+
+        # While the window is being resized a scaled snapshot stands in for the clock faces;
+        # the exact refit runs once, when the resize settles and the mouse is released
+        self.resize_preview = None
         self.resize_timer = QTimer()
         self.resize_timer.setSingleShot(True)
-        self.resize_timer.timeout.connect(self.adjust_font_sizes)
+        self.resize_timer.timeout.connect(self.on_resize_settled)
         
         self.init_ui()
+
+        # React to individual setting changes instead of re-applying everything
+        signals = self.config.signals
+        signals.background_color_changed.connect(self.on_background_color_changed)
+        signals.clock_text_color_changed.connect(self.set_text_color)
+        signals.toggle_24h_changed.connect(self.on_time_format_changed)
+        signals.relativeFontSize_changed.connect(self.adjust_font_sizes)
+        signals.flash_duration_changed.connect(self.update_flash_animation)
+        signals.flash_color_changed.connect(self.update_flash_animation)
+        signals.background_color_changed.connect(self.update_flash_animation)
         
 
     def init_ui(self):    
@@ -541,40 +764,38 @@ class BigClockApp(QWidget):
         self.load_font()
         
         # Initialize UI elements
+        self.formatter = ClockFormatter()
         self.date_label = self.create_date_label()
         self.time_label = self.create_time_label()
 
         self.setup_layouts()
-        self.update_time()
+        if self.owns_scheduler:
+            self.scheduler.start()  # Emits the first tick right away
+        else:
+            self.update_time()
 
     def create_date_label(self):
         """Create and return the date label."""
-        label = QLabel(self)
-        label.setAlignment(Qt.AlignCenter)
-        label.setStyleSheet(f"color: {self.config.clock_text_color.name()};")
-        label.setSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.MinimumExpanding)
-        # label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        # label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
-        # label.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
-        return label
+        return self.create_clock_face()
 
     def create_time_label(self):
         """Create and return the time label."""
-        label = QLabel(self)
-        label.setAlignment(Qt.AlignCenter)
-        label.setStyleSheet(f"color: {self.config.clock_text_color.name()};")
-        # label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        label.setSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.MinimumExpanding)
-        # label.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
-        # label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
-        return label
+        return self.create_clock_face()
+
+    def create_clock_face(self):
+        """Create a cell-cached text display that only repaints the characters that change."""
+        face = ClockFace(self)
+        face.set_text_color(self.config.clock_text_color)
+        face.set_background_color(self._flash_color)
+        return face
 
     def eventFilter(self, obj, event):
-        """Filter resize and mouse events."""
         """Filter resize and mouse events."""
         if event.type() == QEvent.Resize:
             if not self.is_adjusting_font:
-                self.resize_timer.start(100)  # Delay adjustment for smooth resizing
+                if self._fits and self.isVisible():
+                    self.show_resize_preview(event.oldSize())
+                self.resize_timer.start(RESIZE_SETTLE_MS)  # Delay adjustment for smooth resizing
             # Do not return True; allow the event to propagate
             return False  # Indicate that the event has not been fully handled
         return super().eventFilter(obj, event)
@@ -584,28 +805,41 @@ class BigClockApp(QWidget):
         palette = self.palette()
         palette.setColor(QPalette.Window, QColor(color))
         self.setPalette(palette)
-        self.setAutoFillBackground(True)
+        # paintEvent fills the background itself, so Qt doesn't need to erase it first
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
 
     def load_font(self):
         """Load the custom font or use default."""
+        with StartupProfiler().span("font-load"):
+            self.font = QFont(self.clock_font())
+        self.font_family = self.font.family()
+
+    @classmethod
+    def clock_font(cls):
+        """Return the shared clock font, registering it with Qt on first use."""
+        if cls._clock_font is None:
+            cls._clock_font = cls._load_font()
+        return cls._clock_font
+
+    @staticmethod
+    def _load_font():
         font_db = QFontDatabase()
         try:
             if FONT:
-                self.font = QFont(FONT)
+                font = QFont(FONT)
             elif FONT_PATH:
                 font_id = font_db.addApplicationFont(str(FONT_PATH))
                 if font_id == -1:
                     raise RuntimeError("Failed to load font")
                 font_family = font_db.applicationFontFamilies(font_id)[0]
-                self.font = QFont(font_family)
+                font = QFont(font_family)
             else:
                 raise RuntimeError("No font specified")
         except Exception as e:
             logging.warning(f"Failed to load specified font. Defaulting to Courier: {e}")
-            self.font = QFont()
-            self.font.setStyleHint(QFont.TypeWriter)
-        
-        self.font_family = self.font.family()
+            font = QFont()
+            font.setStyleHint(QFont.TypeWriter)
+        return font
             
     def setup_layouts(self):
         """Set up the layout for the widget with resizable dimensions."""
@@ -638,48 +872,92 @@ class BigClockApp(QWidget):
         self.setLayout(main_layout)
 
     def determine_flash_length(self):
+        self.numFlashes, self.flashDur = self.flash_length(self.config.flash_duration)
+
+    @staticmethod
+    def flash_length(duration):
+        """Number of flashes, and the length of each in ms, for a flash lasting duration seconds."""
         # round down to the nearest whole number
-        int_flash_dur = int(self.config.flash_duration)
-        numFlashes = int_flash_dur*2
-        flashtime = (self.config.flash_duration * 1000)/numFlashes
-        self.numFlashes = max(int(numFlashes), 1)
-        self.flashDur = max(int(flashtime), 1)
+        int_flash_dur = int(duration)
+        numFlashes = max(int_flash_dur*2, 1)
+        flashtime = (duration * 1000)/numFlashes
+        return int(numFlashes), max(int(flashtime), 1)
      
-    def update_time(self):
+    def update_time(self, now=None):
         """Update the displayed time and date."""
-        now = datetime.now()
-        if self.config.toggle_24h:
-            time_format = "%H:%M:%S"
-        else:
-            time_format = "%I:%M:%S %p"
-        self.time_label.setText(now.strftime(time_format))
-        self.date_label.setText(now.strftime("%A, %B %d, %Y"))
-        
-        # Check if it's on the hour (0 minutes and 0 seconds)
-        if now.minute == 0 and now.second == 0:
-            if isinstance(self.parent(), MainWindow):
-                self.parent().switch_to_wiggle_flash(now.hour)
-        elif now.minute % self.config.flash_regularity == 0 and now.second == 0:
-            self.start_flash()  # Regular flashing
+        if now is None:
+            now = self.clock.now()
+        elif self.instruments.enabled and self.scheduler.tick_boundary is not None:
+            # Called by the scheduler: how far past the intended second boundary did the tick land
+            self.instruments.record("tick_late", (now - self.scheduler.tick_boundary).total_seconds() * 1000)
+        # Only hand the faces text that actually changed; the date changes once a day
+        time_text = self.formatter.time_text(now, self.config.toggle_24h)
+        if time_text != self.time_label.text():
+            self.time_label.setText(time_text)
+        date_text = self.formatter.date_text(now)
+        if date_text != self.date_label.text():
+            self.date_label.setText(date_text)
+
+    def on_hour_reached(self, hour):
+        """Hand the top of the hour over to the main window's wiggle announcement."""
+        if isinstance(self.parent(), MainWindow):
+            self.parent().switch_to_wiggle_flash(hour)
                           
+    def update_flash_animation(self, *_):
+        """Precompute the flash color ramp; called when the flash duration or colors change."""
+        # Parse configs set by user and determine the number of flashes and their duration
+        self.determine_flash_length() # saves values as self.numFlashes and self.flashDur
+        self.flash_ramp = FlashRamp.get(
+            self.config.background_color, self.config.flash_color, self.flashDur, self.flash_easing
+        )
+
     def start_flash(self):
-        self.determine_flash_length()  # Recalculate durations based on current settings
-        
+        if self.instruments.enabled:
+            skew = self.clock.now() - self.scheduler.fired_deadline
+            self.instruments.record("flash_skew", skew.total_seconds() * 1000)
         logging.debug(f"Starting flash with {self.numFlashes} flashes of {self.flashDur} ms each.")
-        self.flash_animation.setDuration(self.flashDur)
-        self.flash_animation.setLoopCount(self.numFlashes)
-        self.flash_animation.setStartValue(self.config.background_color)
-        self.flash_animation.setEndValue(self.config.flash_color)
-        self.flash_animation.start()
-        
-        # Total duration of the flashing sequence
-        total_flash_duration_ms = int(self.config.flash_duration * 1000)
-        self.flash_timer.start(total_flash_duration_ms)
+        self.flash_engine.start(self.flash_ramp, self.numFlashes)
+
+    def start_reminder(self, reminder):
+        """
+        Flash a reminder in its own color and length, and play its sound from the window
+        that has audio. An announcing reminder shows its name on the wiggle screen instead.
+        """
+        if self.instruments.enabled:
+            skew = self.clock.now() - self.reminders.fired_deadline
+            self.instruments.record("reminder_skew", skew.total_seconds() * 1000)
+        logging.info(f"Reminder: {reminder.name}")
+        if reminder.announce:
+            self.main_window.show_announcement(reminder.name)
+            return
+        color = QColor(reminder.color) if reminder.color else QColor()
+        if not color.isValid():
+            color = self.config.flash_color
+        flashes, flash_ms = self.flash_length(reminder.duration or self.config.flash_duration)
+        ramp = FlashRamp.get(self.config.background_color, color, flash_ms, self.flash_easing)
+        self.flash_engine.start(ramp, flashes)
+        if reminder.sound and self.main_window.plays_audio:
+            self.play_reminder_sound(reminder.sound)
+
+    def play_reminder_sound(self, sound):
+        try:
+            from sound_pool import SoundPool
+        except ImportError as e:
+            logging.warning(f"QtMultimedia unavailable, reminder sound disabled: {e}")
+            return
+        # Relative paths name one of the bundled sounds
+        path = RESOURCE_PATH / pathlib.Path(sound).expanduser()
+        pool = SoundPool()
+        if pool.load(path):
+            pool.play(path, self.config.volume_level)
+
+    def set_flash_frame(self, color):
+        """Show one frame of the flash ramp."""
+        self.flash_color = color  # Use the property setter
         
     def stop_flash(self):
         """Stop the flashing animation and reset the background."""
-        self.flash_animation.stop()
-        self.flash_timer.stop()
+        self.flash_engine.stop()
         self.flash_color = self.config.background_color  # Use the property setter
 
     @pyqtProperty(QColor, notify=flashColorChanged)
@@ -691,63 +969,42 @@ class BigClockApp(QWidget):
         if self._flash_color != color:
             self._flash_color = color
             self.flashColorChanged.emit()  # Emit the notify signal
+            self.time_label.set_background_color(color)
+            self.date_label.set_background_color(color)
             self.update()  # Trigger a repaint
 
     def paintEvent(self, event):
         """Custom paint event to handle background color changes."""
+        start = time.perf_counter() if self.instruments.enabled else None
         painter = QPainter(self)
-        painter.fillRect(self.rect(), self._flash_color)
+        painter.fillRect(event.rect(), self._flash_color)
+        painter.end()
+        if start is not None:
+            self.instruments.record("paint.clock", (time.perf_counter() - start) * 1000)
+        if not self._first_frame_painted:
+            self._first_frame_painted = True
+            StartupProfiler().mark("first-frame")
+            self.main_window.on_first_frame()
         
     # triggered when the settings button is clicked
-    def show_settings_dialog(self):
-        """Display the settings dialog and update the config if settings are modified."""
-        settings_dialog = SettingsDialog(self)
-        if settings_dialog.exec_() == QDialog.Accepted:
-            # Update the config with new settings
-            self.config.flash_duration = settings_dialog.flash_duration_input.value()
-            self.config.toggle_24h = settings_dialog.toggle_24h.isChecked()
-            self.config.flash_regularity = int(settings_dialog.flash_regularity_combo.currentText())
-            self.config.audio_path = settings_dialog.audio_input.text()
-            self.config.volume_level = settings_dialog.volume_slider.value()
-            self.config.background_color = settings_dialog.background_color
-            self.config.flash_color = settings_dialog.flash_color
-            self.config.clock_text_color = settings_dialog.clock_text_color
-            self.config.toolbar_color = settings_dialog.toolbar_color
-
-            # Apply updated settings dynamically
-            self.set_background_color(self.config.background_color)
-            self.date_label.setStyleSheet(f"color: {self.config.clock_text_color.name()};")
-            self.time_label.setStyleSheet(f"color: {self.config.clock_text_color.name()};")
-            # Adjust font sizes
-            self.adjust_font_sizes()
-            
     def open_settings_dialog(self):
-        """Display the settings dialog and update the config if settings are modified."""
-        # logging.info("open_settings_dialog called")  # Added print statement
-        # Display the settings dialog
-        settings_dialog = SettingsDialog(self)
-        if settings_dialog.exec_() == QDialog.Accepted:
-            # Update the config with new settings
-            self.config.flash_duration = settings_dialog.flash_duration_input.value()
-            self.config.toggle_24h = settings_dialog.toggle_24h_clock.isChecked()
-            self.config.flash_regularity = int(settings_dialog.flash_regularity_combo.currentText())
-            self.config.audio_path = settings_dialog.audio_input.text()
-            self.config.volume_level = settings_dialog.volume_slider.value() / 100.0
-            self.config.background_color = settings_dialog.config.background_color
-            self.config.flash_color = settings_dialog.config.flash_color
-            self.config.clock_text_color = settings_dialog.config.clock_text_color
-            self.config.toolbar_color = settings_dialog.config.toolbar_color
-
-            # Apply updated settings dynamically
-            self.set_background_color(self.config.background_color)
-            self.date_label.setStyleSheet(f"color: {self.config.clock_text_color.name()};")
-            self.time_label.setStyleSheet(f"color: {self.config.clock_text_color.name()};")
-            
-            # Adjust font sizes
-            self.adjust_font_sizes()
-            
-            # Update volume in wiggle flash
-            self.main_window.update_audio_volume()
+        """Display the settings dialog; accepted changes reach their subscribers via AppConfig.signals."""
+        SettingsDialog(self).exec_()
+
+    def set_text_color(self, color):
+        """Apply the clock text color to both labels."""
+        self.date_label.set_text_color(color)
+        self.time_label.set_text_color(color)
+
+    def on_background_color_changed(self, color):
+        self.set_background_color(color)
+        if not self.flash_engine.is_running():
+            self.flash_color = color
+
+    def on_time_format_changed(self, toggle_24h):
+        # The sample text used for fitting differs between the 12h and 24h formats
+        self.update_time()
+        self.adjust_font_sizes()
     
     # def resizeEvent(self, event):
     #     super().resizeEvent(event)
@@ -757,38 +1014,56 @@ class BigClockApp(QWidget):
     #     else:
     #         return
             
-    def get_optimal_font_size(self, max_width, max_height):
-        """Find the optimal font size for the given text to fit within max_width and max_height."""
+    def get_optimal_font_size(self, max_width, max_height, previous=None):
+        """
+        Find the optimal font size for the given text to fit within max_width and max_height.
+
+        previous is the label's size before a resize; text extents are close to linear in
+        point size, so scaling its (cached) extents to the new box predicts the answer.
+        """
         if max_height<1 or max_width<1:
             logging.error(f"Invalid dimensions for font size calculation... {max_width} by {max_height}")
             return 12
-        # Set initial font size boundaries
-        font_size = 12
-        max_font_size = 8000 # arbitrary upper limit
-        sample_text = "00:00:00" if self.config.toggle_24h else "00:00:00 AM" 
-
-        while font_size <= max_font_size:
-            font = QFont(self.font_family, font_size)
-            fm = QFontMetrics(font)
-            text_width = fm.horizontalAdvance(sample_text)
-                
-            text_height = fm.height()
-            if text_width <= max_width and text_height <= max_height:
-                # Font size fits, try larger size
-                font_size += 1
-            else:
-                # Font size too big, go with one smaller size (which ostensibly worked!) 
-                font_size -= 1
-                break
-        # Return the font with the optimal size
-        return font_size
+        # Digits are laid out in cells as wide as the widest digit, so fit using that digit
+        d = widest_digit(self.font_family)
+        sample_text = f"{d}{d}:{d}{d}:{d}{d}" if self.config.toggle_24h else f"{d}{d}:{d}{d}:{d}{d} AM"
+        # Cached by (family, text, width, height) and shared by the time and date labels
+        return FontFitter.fit(self.font_family, sample_text, max_width, max_height, near=previous)
+
+    def show_resize_preview(self, old_size):
+        """Cover the clock faces with a scaled snapshot of them for the duration of a resize."""
+        title_height = self.title_bar.height()
+        if self.resize_preview is None:
+            self.resize_preview = ScaledPreview(self)
+        if not self.resize_preview.isVisible() and old_size.isValid():
+            # Snapshot the faces as they were laid out at the size the resize started from
+            snapshot = self.grab(QRect(0, title_height, old_size.width(), old_size.height() - title_height))
+            self.resize_preview.set_snapshot(snapshot, self._flash_color)
+            self.resize_preview.raise_()
+            self.resize_preview.show()
+        self.resize_preview.setGeometry(self.rect().adjusted(0, title_height, 0, 0))
+
+    def on_resize_settled(self):
+        """Refit once the resize is over; while a mouse button is still down the user is still dragging."""
+        if QApplication.mouseButtons() != Qt.NoButton:
+            self.resize_timer.start(RESIZE_SETTLE_MS)
+            return
+        self.adjust_font_sizes()
+        if self.resize_preview is not None:
+            self.resize_preview.hide()
         
     def showEvent(self, event):
         super().showEvent(event)
+        self.scheduler.set_ticking(True, self)
         if self.width() > 0 and self.height() > 0:
             self.adjust_font_sizes()
         else:
-            QTimer.singleShot(0, self.adjust_font_sizes)
+            self.clock.single_shot(0, self.adjust_font_sizes)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        # Nothing to redraw while the wiggle screen covers the clock; event deadlines stay armed
+        self.scheduler.set_ticking(False, self)
             
     def adjust_font_sizes(self):
         """Adjust the font sizes of the time and date labels to fit within the window."""
@@ -812,14 +1087,23 @@ class BigClockApp(QWidget):
         time_label_height = available_height * k
         date_label_height = available_height * (1-k)
 
-        # Adjust font size for the time and date labels
-        self.date_label_font_size = self.get_optimal_font_size(available_width, date_label_height)
-        date_font = QFont(self.font_family, self.date_label_font_size)
-        self.date_label.setFont(date_font)
-
-        self.time_label_font_size = self.get_optimal_font_size(available_width, time_label_height)
-        time_font = QFont(self.font.family(), self.time_label_font_size)
-        self.time_label.setFont(time_font)
+        # A window size seen before (e.g. a screen that was plugged back in) needs no search at all
+        memo_key = (self.font_family, self.config.toggle_24h, ratio, available_width, available_height)
+        if memo_key not in self._fit_memo:
+            # Adjust font size for the time and date labels, predicting each from its previous fit
+            date_size = self.get_optimal_font_size(available_width, date_label_height, self._fits.get("date"))
+            time_size = self.get_optimal_font_size(available_width, time_label_height, self._fits.get("time"))
+            self._fit_memo[memo_key] = (date_size, time_size)
+            if len(self._fit_memo) > FIT_MEMO_SIZE:
+                del self._fit_memo[next(iter(self._fit_memo))]
+        self.date_label_font_size, self.time_label_font_size = self._fit_memo[memo_key]
+        self._fits["date"] = self.date_label_font_size
+        self._fits["time"] = self.time_label_font_size
+
+        if self.date_label.font().pointSize() != self.date_label_font_size:
+            self.date_label.setFont(QFont(self.font_family, self.date_label_font_size))
+        if self.time_label.font().pointSize() != self.time_label_font_size:
+            self.time_label.setFont(QFont(self.font.family(), self.time_label_font_size))
 
         self.update()
         self.is_adjusting_font = False 
@@ -829,12 +1113,23 @@ class BigClockApp(QWidget):
 class WiggleFlash(QWidget):
     """Widget for displaying wiggling text animation on hour change."""
 
-    def __init__(self, parent=None):
+    _font_seed = random.random()  # one per process; see pick_next_family
+
+    def __init__(self, parent=None, clock=None, audio=True):
         super().__init__(parent)
         self.config = AppConfig()
+        self.clock = clock or SystemClock()
+        self.instruments = Instrumentation()
         self.text = ""
         self.step = 0
-        self.timer = QBasicTimer() 
+
+        # Frame pacing: the phase is derived from the clock, the timer only says when to look
+        self.timer = self.clock.create_timer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.advance_frame)
+        self._animating = False
+        self._animation_start_ms = 0
+        self._paint_cost_ms = 0.0  # moving average of paintEvent durations
 
         # Set up background
         self.setAutoFillBackground(True)
@@ -842,74 +1137,201 @@ class WiggleFlash(QWidget):
         palette.setColor(QPalette.Window, QColor("white"))
         self.setPalette(palette)
         
-        # Set up font
-        self.myfonts = { "Bondoni 72", "Charlkboard", "Futura", "Herculanum", "Luminari", "Silom" }
-
-        # Start the timer for animation
-        self.timer.start(60, self)  # This registers a timer event with the Qt event loop
-
-        # Set up audio player
-        self.player = QMediaPlayer()
-        self.player.setMedia(QMediaContent(QUrl.fromLocalFile(self.config.audio_path)))
-        self.player.setVolume(int(self.config.volume_level * 100))  # Convert to integer percentage
+        # Set up font; one family is picked at random for each announcement
+        self.myfonts = ("Bondoni 72", "Charlkboard", "Futura", "Herculanum", "Luminari", "Silom")
+        self.next_family = self.pick_next_family()
+        self.atlas = None
+
+        # Idle-time warm-up of the announcement renders, one small step per event loop turn
+        self._warm_steps = []
+        self._warm_timer = QTimer(self)
+        self._warm_timer.setInterval(0)
+        self._warm_timer.timeout.connect(self._warm_step)
+        self.clock.single_shot(0, self.warm_up)
+
+        # The animation timer only runs while the widget is on screen (see showEvent/hideEvent)
+
+        # Set up audio; windows on the other screens of a ClockGroup stay silent
+        self.audio = None
+        if audio:
+            self.enable_audio()
+
+        # The 12h/24h choice changes the next announcement
+        self.config.signals.toggle_24h_changed.connect(self.warm_up)
+
+    def enable_audio(self):
+        """Set up the hourly clip; it is decoded ahead of time so it starts together with the visuals."""
+        if self.audio is not None:
+            return
+        try:
+            from audio_engine import AudioEngine
+        except ImportError as e:
+            logging.warning(f"QtMultimedia unavailable, hourly audio disabled: {e}")
+        else:
+            self.audio = AudioEngine(self)
+            self.audio.set_volume(self.config.volume_level)
+            self.audio.load(self.config.audio_path)  # decoded PCM is shared through AudioEngine's cache
+            self.config.signals.volume_level_changed.connect(self.audio.set_volume)
+            self.config.signals.audio_path_changed.connect(self.audio.load)
    
+    @staticmethod
+    def announcement_text(hour, toggle_24h):
+        """Return the announcement shown at the start of the given hour."""
+        if toggle_24h:
+            return f"IT'S NOW {hour:02d}:00, BITCH!"
+        am_pm = "AM" if hour < 12 else "PM"
+        hour = hour if hour <= 12 else hour - 12
+        hour = 12 if hour == 0 else hour
+        return f"IT'S NOW {hour:d}:00 {am_pm}, BITCH!"
+
     def set_hour(self, hour):
         """Set the text to display the current hour and play audio."""
-        if self.config.toggle_24h:
-            self.text = f"IT'S NOW {hour:02d}:00, BITCH!"
-        else:
-            am_pm = "AM" if hour < 12 else "PM"
-            hour = hour if hour <= 12 else hour - 12
-            hour = 12 if hour == 0 else hour
-            self.text = f"IT'S NOW {hour:d}:00 {am_pm}, BITCH!"
-        self.player.play()
+        self.set_text(self.announcement_text(hour, self.config.toggle_24h))
+        if self.audio is not None:
+            self.audio.play()
+
+    def set_text(self, text):
+        """Set the text to wiggle."""
+        self.text = text
+
+        # Normally already warmed up; otherwise rasterize now so frames are still just blits
+        self.atlas = GlyphAtlas.for_font(self.next_family, WIGGLE_FONT_SIZE, self.devicePixelRatioF())
+        self.atlas.prepare(self.text)
         self.update()
 
+    def warm_up(self):
+        """
+        Prepare the next hour's announcement during idle time.
+
+        All 24 hours are laid out in both the 12h and 24h variants, and the glyphs of the
+        upcoming announcement are rasterized, so the hour switch paints its first frame
+        straight from the cache. Re-run whenever the font or the time format changes.
+        """
+        atlas = GlyphAtlas.for_font(self.next_family, WIGGLE_FONT_SIZE, self.devicePixelRatioF())
+        texts = [self.announcement_text(hour, fmt) for fmt in (True, False) for hour in range(24)]
+        upcoming = self.announcement_text((self.clock.now().hour + 1) % 24, self.config.toggle_24h)
+        atlas.retain([upcoming])
+
+        self._warm_steps = [lambda text=text: atlas.layout(text) for text in texts]
+        self._warm_steps += [
+            lambda char=char, index=index: atlas.glyph(char, index)
+            for char in set(upcoming) for index in range(HUE_STEPS)
+        ]
+        self._warm_timer.start()
+
+    def _warm_step(self):
+        """Run one warm-up step; the zero-interval timer only fires when the event loop is idle."""
+        if self._warm_steps:
+            self._warm_steps.pop()()
+        if not self._warm_steps:
+            self._warm_timer.stop()
+
     def paintEvent(self, event):
         """Paint the wiggling text."""
-        font = QFont()
-        font.setFamily(random.choice(self.myfonts))
-        font.setPointSize(180)
-        font.setBold(False)
-        font.setItalic(False)
-        
-        painter = QPainter()
-        painter.setFont(font)
-        metrics = painter.fontMetrics()
-        # Center the text horizontally and vertically
-        x = (self.width() - metrics.horizontalAdvance(self.text)) // 2
-        y = (self.height() + metrics.ascent() - metrics.descent()) // 2
+        if self.atlas is None or not self.text:
+            return
+        start = time.perf_counter()
 
-        # A sine table to give dy, the change in y coordinate, giving the text a wiggling effect
-        sine_table = [0, 38, 71, 92, 100, 92, 71, 38, 0, -38, -71, -92, -100, -92, -71, -38]
+        atlas = self.atlas
+        positions, text_width = atlas.layout(self.text)
+        # Center the text horizontally and vertically
+        x = (self.width() - text_width) // 2
+        y = (self.height() + atlas.metrics.ascent() - atlas.metrics.descent()) // 2
 
-        # Paint each letter of the text with a wiggling effect
+        painter = QPainter(self)
+        # Blit each pre-rendered letter with its y position modified by the sine table
         for i, char in enumerate(self.text):
-            index = (self.step + i) % 16
-            dy = (sine_table[index] * metrics.height()) // 400
-
-            # Set color based on the step
-            color = QColor()
-            color.setHsv((15 - index) * 16, 255, 191)
-            painter.setPen(color)
-
-            # Draw each character with its y position modified by the sine table
-            painter.drawText(x, y - dy, char)
-            x += metrics.horizontalAdvance(char)
-
-    def timerEvent(self, event):
-        """Update the step for the wiggling animation."""
-        if event.timerId() == self.timer.timerId():
-            self.step += 1
+            index = (self.step + i) % HUE_STEPS
+            glyph = atlas.glyph(char, index)
+            if glyph is not None:
+                pixmap, dx, dy = glyph
+                painter.drawPixmap(x + positions[i] + dx, y - atlas.offsets[index] + dy, pixmap)
+        painter.end()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._paint_cost_ms += (elapsed_ms - self._paint_cost_ms) / 4
+        if self.instruments.enabled:
+            self.instruments.record("paint.wiggle", elapsed_ms)
+
+    def start_animation(self):
+        """Start the wiggle from phase 0; called whenever the widget becomes visible."""
+        if not self._animating:
+            self._animating = True
+            self._animation_start_ms = self.clock.monotonic_ms()
+            self.step = 0
+            self.schedule_next_frame()
+
+    def stop_animation(self):
+        """Stop the wiggle timer so the hidden widget costs no wakeups."""
+        self._animating = False
+        self.timer.stop()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.start_animation()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.stop_animation()
+        # Pick the font for the next announcement and get it ready well ahead of time
+        self.next_family = self.pick_next_family()
+        self.warm_up()
+
+    def pick_next_family(self):
+        """
+        Pick the font for the next announcement at random. The choice is seeded with the
+        upcoming hour, so the windows on every screen pick the same font and share its glyphs.
+        """
+        upcoming = self.clock.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        return random.Random(f"{self._font_seed}:{upcoming:%Y-%m-%d %H}").choice(self.myfonts)
+
+    def advance_frame(self):
+        """
+        Show the phase for the current time.
+
+        The step comes from the time since the animation started, so a late wakeup jumps
+        straight to the right phase (the missed steps are never painted) and the wiggle
+        keeps its speed however busy the event loop is.
+        """
+        if not self._animating:
+            return
+        step = (self.clock.monotonic_ms() - self._animation_start_ms) // WIGGLE_FRAME_MS
+        if step != self.step:
+            if self.instruments.enabled and step - self.step > 1:
+                self.instruments.record("wiggle.skipped", step - self.step - 1)
+            self.step = step
             self.update()  # Trigger a repaint
-        else:
-            super().timerEvent(event)
+        self.schedule_next_frame()
+
+    def frame_stride(self):
+        """
+        How many phase steps the next frame moves on.
+
+        One step per frame unless a frame takes longer than that on this display: steps
+        are then skipped so the frame period covers the refresh interval and the measured
+        paint cost stays within WIGGLE_PAINT_SHARE of the time.
+        """
+        screen = self.screen()
+        refresh_hz = screen.refreshRate() if screen is not None else 0
+        refresh_ms = 1000 / (refresh_hz if refresh_hz > 0 else DEFAULT_REFRESH_HZ)
+        period_ms = max(WIGGLE_FRAME_MS, refresh_ms, self._paint_cost_ms / WIGGLE_PAINT_SHARE)
+        return math.ceil(period_ms / WIGGLE_FRAME_MS)
+
+    def schedule_next_frame(self):
+        """Arm the timer for the moment the next shown step begins."""
+        next_step = self.step + self.frame_stride()
+        due_ms = self._animation_start_ms + next_step * WIGGLE_FRAME_MS
+        self.timer.start(max(due_ms - self.clock.monotonic_ms(), 0))
             
 class CustomTitleBar(QWidget):
     def __init__(self, parent):
         super().__init__(parent)
         self.setAutoFillBackground(True)
         self.setBackgroundRole(QPalette.ColorRole.Highlight)
+
+        config = AppConfig()
+        self.set_toolbar_color(config.toolbar_color)
+        config.signals.toolbar_color_changed.connect(self.set_toolbar_color)
         
         self.old_pos = None
         
@@ -933,6 +1355,14 @@ class CustomTitleBar(QWidget):
             self.title.setText(title)
         title_bar_layout.addWidget(self.title)
 
+        # Live timings (--overlay): latest/worst recent value of each metric, in ms
+        if Instrumentation().overlay:
+            self.stats_label = QLabel(self)
+            title_bar_layout.addWidget(self.stats_label)
+            self.stats_timer = QTimer(self)
+            self.stats_timer.timeout.connect(self.update_stats)
+            self.stats_timer.start(OVERLAY_REFRESH_MS)
+
         # Spacer to push buttons to the right
         title_bar_layout.addStretch()
         
@@ -982,6 +1412,9 @@ class CustomTitleBar(QWidget):
         palette.setColor(QPalette.ColorRole.Window, color)
         self.setPalette(palette)
         
+    def update_stats(self):
+        self.stats_label.setText(Instrumentation().overlay_text())
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.old_pos = event.globalPos()
@@ -997,16 +1430,151 @@ class CustomTitleBar(QWidget):
             
 # --------------------------------------------------
 
+def create_reminder_engine(config, scheduler, parent=None, clock=None):
+    """A ReminderEngine loaded with the configured reminders and kept in step with config and clock changes."""
+    engine = ReminderEngine(config, parent, clock=clock)
+    engine.set_reminders(config.reminders)
+    config.signals.reminders_changed.connect(engine.set_reminders)
+    scheduler.time_jumped.connect(engine.replan)
+    return engine
+
+
+def create_calendar_feed(config, engine, scheduler, clock=None):
+    """
+    A CalendarFeed adding the configured calendars' events to engine, kept in step with
+    config and clock changes. It reads nothing until its start(), once the clock is on screen.
+    """
+    # Calendar events are added to the engine as one-off reminders, so they are added again
+    # whenever set_reminders() has replaced everything
+    calendars = CalendarFeed(config, engine, CALENDAR_INDEX_PATH, parent=engine, clock=clock)
+    config.signals.reminders_changed.connect(calendars.restore)
+    scheduler.time_jumped.connect(calendars.refresh)
+    return calendars
+
+
+class ClockGroup(QObject):
+    """
+    One clock window per chosen screen, all in one process.
+
+    The windows share a single TickScheduler, so the process wakes once per second and
+    once per event however many screens show the clock. AppConfig, the clock font, the
+    font fits, the glyph atlases and the decoded hourly clip are process-wide already, so
+    an extra screen costs little more than its own widgets. Only the first window plays
+    the hourly clip.
+
+    The choices (see ScreenManager.resolve) are re-resolved whenever screens are plugged
+    or unplugged, opening and closing windows to match. If none of the chosen screens is
+    connected, a single window goes where a lone clock would.
+    """
+
+    def __init__(self, choices, parent=None, clock=None):
+        super().__init__(parent)
+        self.config = AppConfig()
+        self.clock = clock or SystemClock()
+        self.choices = choices
+        self.windows = []
+        self._shown = False
+
+        self.scheduler = TickScheduler(self.config, self, clock=self.clock)
+        self.config.signals.flash_regularity_changed.connect(self.scheduler.reschedule)
+        self.reminders = create_reminder_engine(self.config, self.scheduler, self, clock=self.clock)
+        self.calendars = create_calendar_feed(self.config, self.reminders, self.scheduler, clock=self.clock)
+
+        if Instrumentation().enabled:
+            self.instrumentation_timer = self.clock.create_timer(self)
+            self.instrumentation_timer.timeout.connect(Instrumentation().log_summary)
+            self.instrumentation_timer.start(LOG_INTERVAL_MS)
+
+        self.update_windows()
+        ScreenManager().signals.screens_changed.connect(self.update_windows)
+        # The windows are top-level, not children of the group: close them while the shared
+        # scheduler still exists rather than leave them to interpreter teardown
+        QApplication.instance().aboutToQuit.connect(self.close)
+        self.scheduler.start()  # Emits the first tick to every window right away
+
+    def show(self):
+        self._shown = True
+        for window in self.windows:
+            window.show()
+
+    def close(self):
+        for window in self.windows:
+            window.close()
+
+    def update_windows(self):
+        """Open a window on each chosen screen that lacks one and close those whose screen is gone."""
+        screens = ScreenManager()
+        chosen = screens.resolve(self.choices) or [screens.clock_screen()]
+        chosen = [screen for screen in chosen if screen is not None]
+
+        # Open the new windows first, so the application never runs out of windows and quits
+        covered = [window.target_screen for window in self.windows]
+        for screen in chosen:
+            if screen not in covered:
+                logging.info(f"Opening a clock on screen {screen.name()!r}")
+                window = MainWindow(
+                    clock=self.clock, scheduler=self.scheduler, reminders=self.reminders,
+                    screen=screen, audio=not self.windows,
+                )
+                self.windows.append(window)
+                window.first_frame.connect(self.calendars.start)  # whichever window paints first
+                if self._shown:
+                    window.show()
+
+        for window in [window for window in self.windows if window.target_screen not in chosen]:
+            logging.info("Closing the clock of a screen that is no longer connected")
+            self.windows.remove(window)
+            window.close()
+            window.deleteLater()
+
+        if self.windows and not any(window.plays_audio for window in self.windows):
+            self.windows[0].enable_audio()
+
+def parse_args(argv):
+    """Split our own command line options from the ones meant for Qt."""
+    parser = argparse.ArgumentParser(description="ADHD Clock")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="report import, font-load, dialog-build and first-paint timings")
+    parser.add_argument("--settings", action="store_true",
+                        help="show the settings dialog at startup even when saved settings exist")
+    parser.add_argument("--skip-settings", action="store_true",
+                        help="start straight into the clock without showing the settings dialog")
+    parser.add_argument("--exit-after-first-frame", action="store_true",
+                        help="quit as soon as the clock has painted (used by benchmarks/bench_startup.py)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="record tick lateness, paint times and flash skew and log a summary every minute")
+    parser.add_argument("--overlay", action="store_true",
+                        help="also show the live timings in the title bar (implies --instrument)")
+    parser.add_argument("--screens", nargs="+", metavar="SCREEN",
+                        help="show a clock on each of these screens (index, name, or 'extended' for all but the primary)")
+    return parser.parse_known_args(argv)
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)  # Create the application instance
-
-    # Create the settings dialog and show it
-    settings_dialog = SettingsDialog()
-    if settings_dialog.exec_() == QDialog.Accepted:
-        # User accepted the settings, proceed to show the main window
-        main_window = MainWindow()
-        main_window.show()
-        sys.exit(app.exec_())
+    args, qt_args = parse_args(sys.argv[1:])
+    if args.instrument or args.overlay:
+        Instrumentation().enable(overlay=args.overlay)
+    app = QApplication(sys.argv[:1] + qt_args)  # Create the application instance
+    config = AppConfig()
+    app.aboutToQuit.connect(config.store.flush)  # don't lose a save that is still being debounced
+
+    # With saved settings the dialog is skipped; it stays reachable from the title bar
+    if args.settings or not (args.skip_settings or config.loaded_from_disk):
+        # Create the settings dialog and show it
+        settings_dialog = SettingsDialog()
+        if settings_dialog.exec_() != QDialog.Accepted:
+            # User canceled the settings, exit the application
+            app.quit()
+            sys.exit(0)
+
+    # User accepted the settings, proceed to show the main window (or one per chosen screen)
+    if args.screens:
+        main_window = ClockGroup(args.screens)
+        first_window = main_window.windows[0]
     else:
-        # User canceled the settings, exit the application
-        app.quit()
\ No newline at end of file
+        main_window = first_window = MainWindow()
+    if args.profile_startup:
+        first_window.first_frame.connect(StartupProfiler().report)
+    if args.exit_after_first_frame:
+        first_window.first_frame.connect(app.quit, Qt.QueuedConnection)
+    main_window.show()
+    sys.exit(app.exec_())
@@ -0,0 +1,577 @@
+import calendar
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from PyQt5.QtCore import QCoreApplication, QObject, Qt, pyqtSignal
+from config_store import ConfigStore
+from reminders import Reminder
+from time_source import SystemClock
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # events are then taken to be in local time
+    ZoneInfo = None
+
+CALENDAR_WINDOW = timedelta(days=2)  # occurrences this far ahead are turned into reminders
+CALENDAR_REFRESH_MS = 60 * 60 * 1000  # re-check the files and move the window on this often
+INDEX_VERSION = 1
+
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+RRULE_PARTS = {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY", "BYMONTHDAY", "BYMONTH", "WKST"}
+EVENT_PROPERTIES = {"UID", "SUMMARY", "DTSTART", "RRULE", "RECURRENCE-ID", "STATUS"}
+# A series is expanded this much wider than the window (converted to its own zone), for a
+# daylight saving change between the two; the occurrences are then filtered in local time
+ZONE_MARGIN = timedelta(hours=2)
+
+
+def unfold(lines):
+    """Join folded content lines (RFC 5545 3.1): a line starting with a space or tab continues the previous one."""
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t"):
+            if current is not None:
+                current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def split_property(line):
+    """Split 'NAME;PARAM=VALUE:text' into (NAME, {PARAM: VALUE}, text), or None if there is no value."""
+    # The value starts at the first colon that isn't inside a quoted parameter value
+    i = line.find(":")
+    if i < 0:
+        return None
+    if '"' in line[:i]:
+        quoted = False
+        for i, char in enumerate(line):
+            if char == '"':
+                quoted = not quoted
+            elif char == ":" and not quoted:
+                break
+        else:
+            return None
+    name, *params = line[:i].split(";")
+    return name.upper(), dict(param.split("=", 1) for param in params if "=" in param), line[i + 1:]
+
+
+def unescape(text):
+    return text.replace("\\n", " ").replace("\\N", " ").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+
+
+def parse_time(value, params):
+    """
+    Return (naive datetime, time zone) for a DATE-TIME value; the zone is "UTC", a TZID,
+    or None for floating (local) time. Returns None for all-day DATE values.
+    """
+    value = value.strip()
+    if params.get("VALUE", "").upper() == "DATE" or len(value) < 15:
+        return None
+    t = datetime(int(value[0:4]), int(value[4:6]), int(value[6:8]), int(value[9:11]), int(value[11:13]), int(value[13:15]))
+    if value.endswith("Z"):
+        return t, "UTC"
+    return t, params.get("TZID", "").strip('"') or None
+
+
+@lru_cache(maxsize=None)
+def zone(tzid):
+    """The ZoneInfo for a TZID, or None for local time (no TZID, no zoneinfo, or a name it doesn't know)."""
+    if tzid is None or ZoneInfo is None:
+        return None
+    try:
+        return ZoneInfo(tzid)
+    except (ValueError, OSError):
+        logging.warning(f"Unknown calendar time zone {tzid!r}; taking its times as local time")
+        return None
+
+
+def to_local(t, tzid):
+    """Convert a naive time in the given zone to naive local time."""
+    tz = zone(tzid)
+    if tz is None:
+        return t
+    return t.replace(tzinfo=tz).astimezone().replace(tzinfo=None)
+
+
+def from_local(t, tzid):
+    """Convert a naive local time to a naive time in the given zone."""
+    tz = zone(tzid)
+    if tz is None:
+        return t
+    return t.astimezone(tz).replace(tzinfo=None)
+
+
+class RecurrenceRule:
+    """
+    The part of RFC 5545 RRULE that meeting calendars use: FREQ=DAILY/WEEKLY/MONTHLY/YEARLY
+    with INTERVAL, COUNT, UNTIL, BYDAY (with ordinals for monthly and yearly rules),
+    BYMONTHDAY, BYMONTH and WKST (the day weekly periods start on, which matters for
+    INTERVAL>1). Raises ValueError for anything else.
+
+    RFC 5545's WKST example, every other week on Tuesday and Sunday, weeks starting on Sunday:
+
+    >>> rule = RecurrenceRule("FREQ=WEEKLY;INTERVAL=2;COUNT=4;BYDAY=TU,SU;WKST=SU")
+    >>> start = datetime(1997, 8, 5, 9, 0)
+    >>> [t.day for t in rule.between(start, start, datetime(1998, 1, 1))]
+    [5, 17, 19, 31]
+
+    Occurrences are generated lazily, period by period, and a rule without COUNT starts
+    right at the requested window, so expanding the next two days of a years-old daily
+    meeting doesn't walk through all the years before.
+    """
+
+    def __init__(self, text, tzid=None):
+        self.text = text
+        parts = dict(part.split("=", 1) for part in text.upper().split(";") if "=" in part)
+        unsupported = set(parts) - RRULE_PARTS
+        if unsupported:
+            raise ValueError(f"unsupported RRULE parts {sorted(unsupported)}")
+        self.freq = parts.get("FREQ")
+        if self.freq not in ("DAILY", "WEEKLY", "MONTHLY", "YEARLY"):
+            raise ValueError(f"unsupported RRULE frequency {self.freq!r}")
+        self.interval = max(int(parts.get("INTERVAL", 1)), 1)
+        self.count = int(parts["COUNT"]) if "COUNT" in parts else None
+
+        self.until = None
+        if "UNTIL" in parts:
+            until = parse_time(parts["UNTIL"], {})
+            if until is None:  # a date: the whole day is included
+                value = parts["UNTIL"]
+                self.until = datetime(int(value[0:4]), int(value[4:6]), int(value[6:8]), 23, 59, 59)
+            elif until[1] == "UTC":
+                self.until = from_local(to_local(until[0], "UTC"), tzid)
+            else:
+                self.until = until[0]
+
+        self.byday = []  # (ordinal or 0, weekday)
+        for day in filter(None, parts.get("BYDAY", "").split(",")):
+            ordinal, weekday = day[:-2], day[-2:]
+            self.byday.append((int(ordinal) if ordinal else 0, WEEKDAYS[weekday]))
+        self.bymonthday = [int(day) for day in filter(None, parts.get("BYMONTHDAY", "").split(","))]
+        self.bymonth = [int(month) for month in filter(None, parts.get("BYMONTH", "").split(","))]
+        self.wkst = WEEKDAYS[parts.get("WKST", "MO")]
+        if self.freq == "YEARLY" and self.byday and not self.bymonth:
+            raise ValueError("yearly BYDAY rules need BYMONTH")
+
+    def between(self, start, after, before):
+        """Yield the occurrences of the series starting at start that fall in [after, before), in order."""
+        skip = self._periods_before(start, after) if self.count is None else 0
+        seen = 0
+        for period in self._periods(start, skip):
+            if period >= before:
+                return
+            for t in self._expand(period, start):
+                if t < start:
+                    continue
+                seen += 1
+                if self.count is not None and seen > self.count:
+                    return
+                if (self.until is not None and t > self.until) or t >= before:
+                    return
+                if t >= after:
+                    yield t
+
+    def _periods(self, start, skip):
+        """Yield the first day of each period (day, WKST of the week, first of the month or year) from start's on."""
+        first_day = datetime(start.year, start.month, start.day)
+        k = skip
+        while True:
+            n = k * self.interval
+            if self.freq == "DAILY":
+                yield first_day + timedelta(days=n)
+            elif self.freq == "WEEKLY":
+                yield first_day - timedelta(days=(start.weekday() - self.wkst) % 7) + timedelta(weeks=n)
+            elif self.freq == "MONTHLY":
+                month = start.year * 12 + start.month - 1 + n
+                if month // 12 > 9999:
+                    return
+                yield datetime(month // 12, month % 12 + 1, 1)
+            else:
+                if start.year + n > 9999:
+                    return
+                yield datetime(start.year + n, 1, 1)
+            k += 1
+
+    def _periods_before(self, start, after):
+        """How many whole periods lie before after, less one to be safe."""
+        if after <= start:
+            return 0
+        if self.freq == "DAILY":
+            periods = (after - start).days // self.interval
+        elif self.freq == "WEEKLY":
+            periods = (after - start).days // (7 * self.interval)
+        elif self.freq == "MONTHLY":
+            periods = ((after.year - start.year) * 12 + after.month - start.month) // self.interval
+        else:
+            periods = (after.year - start.year) // self.interval
+        return max(periods - 1, 0)
+
+    def _expand(self, period, start):
+        """The occurrences within one period, in order."""
+        if self.freq == "DAILY":
+            days = [period.date()]
+        elif self.freq == "WEEKLY":
+            weekdays = {weekday for _, weekday in self.byday} or {start.weekday()}
+            offsets = sorted((weekday - self.wkst) % 7 for weekday in weekdays)  # days into the week
+            days = [period.date() + timedelta(days=offset) for offset in offsets]
+        elif self.freq == "MONTHLY":
+            days = self._month_days(period.year, period.month, start)
+        else:
+            days = []
+            for month in sorted(self.bymonth) or [start.month]:
+                days += self._month_days(period.year, month, start)
+
+        if self.freq in ("DAILY", "WEEKLY"):
+            if self.bymonth:
+                days = [day for day in days if day.month in self.bymonth]
+            if self.bymonthday:
+                days = [day for day in days if self._monthday_matches(day)]
+            if self.byday and self.freq == "DAILY":
+                days = [day for day in days if day.weekday() in {weekday for _, weekday in self.byday}]
+        time_of_day = start.time()
+        return [datetime.combine(day, time_of_day) for day in days]
+
+    def _monthday_matches(self, day):
+        last = calendar.monthrange(day.year, day.month)[1]
+        return any(d == day.day or last + 1 + d == day.day for d in self.bymonthday)
+
+    def _month_days(self, year, month, start):
+        last = calendar.monthrange(year, month)[1]
+        if self.byday:
+            days = set()
+            first_weekday = date(year, month, 1).weekday()
+            for ordinal, weekday in self.byday:
+                matching = list(range(1 + (weekday - first_weekday) % 7, last + 1, 7))
+                if ordinal == 0:
+                    days.update(matching)
+                elif -len(matching) <= ordinal <= len(matching):
+                    days.add(matching[ordinal - 1 if ordinal > 0 else ordinal])
+            if self.bymonthday:
+                days = {day for day in days if self._monthday_matches(date(year, month, day))}
+        elif self.bymonthday:
+            days = {day if day > 0 else last + 1 + day for day in self.bymonthday}
+            days = {day for day in days if 1 <= day <= last}
+        else:
+            days = {start.day} if start.day <= last else set()
+        return [date(year, month, day) for day in sorted(days)]
+
+
+class CalendarEvent:
+    """One timed event or recurring series from a calendar, in the compact form kept in the index."""
+
+    __slots__ = ("summary", "start", "tzid", "rule", "exdates")
+
+    def __init__(self, summary, start, tzid=None, rule=None, exdates=()):
+        self.summary = summary
+        self.start = start  # naive, in tzid's time
+        self.tzid = tzid
+        self.rule = rule
+        self.exdates = set(exdates)  # local start times of the occurrences that were removed or moved
+
+    def occurrences(self, after, before):
+        """Yield the local start times of the occurrences in [after, before)."""
+        if self.rule is None:
+            start = to_local(self.start, self.tzid)
+            if after <= start < before and start not in self.exdates:
+                yield start
+            return
+        zone_after = from_local(after, self.tzid) - ZONE_MARGIN
+        zone_before = from_local(before, self.tzid) + ZONE_MARGIN
+        for t in self.rule.between(self.start, zone_after, zone_before):
+            start = to_local(t, self.tzid)
+            if after <= start < before and start not in self.exdates:
+                yield start
+
+    def to_record(self):
+        return [
+            self.summary, self.start.isoformat(), self.tzid, self.rule.text if self.rule else None,
+            sorted(t.isoformat() for t in self.exdates),
+        ]
+
+    @classmethod
+    def from_record(cls, record):
+        summary, start, tzid, rule, exdates = record
+        return cls(
+            summary, datetime.fromisoformat(start), tzid,
+            RecurrenceRule(rule, tzid) if rule else None,
+            (datetime.fromisoformat(t) for t in exdates),
+        )
+
+
+def read_events(path, not_before):
+    """
+    Stream the events of an .ics file, one unfolded line at a time, and return those that
+    can still occur at or after not_before as CalendarEvents.
+
+    Only the properties of the event being read are held, never the file. All-day and
+    cancelled events are left out; a moved or cancelled occurrence (RECURRENCE-ID) removes
+    that occurrence from its series. A series with a rule this module can't expand keeps
+    only its first occurrence.
+    """
+    events = []
+    series = {}  # UID -> recurring CalendarEvent
+    moved = {}  # UID -> local start times of occurrences overridden by their own VEVENT
+    props = exdates = None
+    nested = 0  # depth of components inside the VEVENT (VALARM)
+    unsupported = 0
+
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        for line in unfold(f):
+            keyword = line[:6].upper()
+            if keyword == "BEGIN:":
+                if line[6:].upper() == "VEVENT":
+                    props, exdates, nested = {}, [], 0
+                elif props is not None:
+                    nested += 1
+                continue
+            if props is None:
+                continue
+            if line[:4].upper() == "END:":
+                if nested:
+                    nested -= 1
+                    continue
+                uid, event, rule_error = _build_event(props, exdates, moved)
+                props = None
+                unsupported += rule_error
+                if event is None:
+                    continue
+                if event.rule is not None and uid:
+                    series[uid] = event
+                if _may_occur(event, not_before):
+                    events.append(event)
+                continue
+            if nested:
+                continue
+            prop = split_property(line)
+            if prop is None:
+                continue
+            name, params, value = prop
+            if name == "EXDATE":
+                exdates.append((params, value))
+            elif name in EVENT_PROPERTIES:
+                props[name] = (params, value)
+
+    for uid, starts in moved.items():
+        if uid in series:
+            series[uid].exdates.update(starts)
+    if unsupported:
+        logging.warning(f"{path}: {unsupported} recurring events use rules that aren't supported; only their first occurrence is kept")
+    return events
+
+
+def _build_event(props, exdates, moved):
+    """Turn the properties of one VEVENT into (UID, CalendarEvent or None, 1 if its rule is unsupported else 0)."""
+    uid = props.get("UID", ({}, ""))[1]
+    cancelled = props.get("STATUS", ({}, ""))[1].upper() == "CANCELLED"
+
+    if "RECURRENCE-ID" in props:
+        # This VEVENT replaces (or, if cancelled, removes) one occurrence of a series
+        recurrence = parse_time(props["RECURRENCE-ID"][1], props["RECURRENCE-ID"][0])
+        if recurrence is not None:
+            moved.setdefault(uid, set()).add(to_local(*recurrence))
+    if cancelled or "DTSTART" not in props:
+        return uid, None, 0
+    start = parse_time(props["DTSTART"][1], props["DTSTART"][0])
+    if start is None:
+        return uid, None, 0  # all-day
+    start, tzid = start
+    summary = unescape(props.get("SUMMARY", ({}, ""))[1]).strip()
+
+    rule = None
+    rule_error = 0
+    if "RRULE" in props and "RECURRENCE-ID" not in props:
+        try:
+            rule = RecurrenceRule(props["RRULE"][1], tzid)
+        except (ValueError, KeyError):
+            rule_error = 1
+
+    removed = set()
+    for params, value in exdates:
+        for part in value.split(","):
+            t = parse_time(part, params)
+            if t is not None:
+                removed.add(to_local(*t))
+    return uid, CalendarEvent(summary, start, tzid, rule, removed), rule_error
+
+
+def _may_occur(event, not_before):
+    if event.rule is None:
+        return to_local(event.start, event.tzid) >= not_before
+    return event.rule.until is None or to_local(event.rule.until, event.tzid) >= not_before
+
+
+class CalendarIndex:
+    """
+    The parsed calendars, cached on disk by path.
+
+    An entry is reused as long as its file's modification time and size are unchanged,
+    so a restart only re-parses the calendars that changed. Entries hold just the events
+    that could still occur when the file was read, in CalendarEvent's compact record form,
+    and are written through a ConfigStore (debounced, atomic).
+    """
+
+    def __init__(self, path):
+        self.store = ConfigStore(path)
+        data = self.store.load() or {}
+        self._files = data.get("files", {}) if data.get("version") == INDEX_VERSION else {}
+        self._events = {}  # path -> (stamp, [CalendarEvent]), the entries already in use
+
+    def events(self, path, not_before):
+        """Return the events of the calendar at path, parsing it only if it changed since it was indexed."""
+        path = str(path)
+        stat = os.stat(path)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        loaded = self._events.get(path)
+        if loaded is not None and loaded[0] == stamp:
+            return loaded[1]
+
+        entry = self._files.get(path)
+        if entry is not None and entry["stamp"] == stamp:
+            events = [CalendarEvent.from_record(record) for record in entry["events"]]
+        else:
+            events = read_events(path, not_before)
+            logging.info(f"Indexed {len(events)} upcoming events from {path}")
+            self._files[path] = {"stamp": stamp, "events": [event.to_record() for event in events]}
+            self.save()
+        self._events[path] = (stamp, events)
+        return events
+
+    def retain(self, paths):
+        """Forget the calendars that are no longer configured."""
+        paths = {str(path) for path in paths}
+        dropped = [path for path in self._files if path not in paths]
+        for path in dropped:
+            del self._files[path]
+            self._events.pop(path, None)
+        if dropped:
+            self.save()
+
+    def save(self):
+        # A copy, as the store writes it from its timer thread; entries are replaced, never changed
+        self.store.schedule_save({"version": INDEX_VERSION, "files": dict(self._files)})
+
+
+class CalendarFeed(QObject):
+    """
+    Turns the configured .ics calendars into one-off reminders on a ReminderEngine: a
+    flash calendar_lead_minutes before each event, and the wiggle announcement of its
+    title when it starts.
+
+    Recurring events are expanded only for the next CALENDAR_WINDOW. Every
+    CALENDAR_REFRESH_MS the window moves on and the files are checked, which costs a
+    stat() per calendar unless one has changed.
+
+    Nothing is read until start(), which the clock calls once it has painted. Loading the
+    index, parsing changed files and expanding the events run on a worker thread; the GUI
+    thread only adds and removes the reminders that changed.
+    """
+
+    _expanded = pyqtSignal(object)  # the wanted (summary, time, announce) set, or None; from the worker
+
+    def __init__(self, config, reminders, index_path, parent=None, clock=None):
+        super().__init__(parent)
+        self.config = config
+        self.reminders = reminders
+        self.clock = clock or SystemClock()
+        self.index_path = index_path
+        self.index = None  # CalendarIndex, loaded by the first worker; only ever used by the worker
+        self._reminder_ids = {}  # (summary, time, announce) -> id in the engine
+        self._started = False
+        self._worker = None
+        self._refresh_pending = False
+        self._expanded.connect(self._apply, Qt.QueuedConnection)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._flush_index)  # don't lose an index save that is still being debounced
+
+        self.timer = self.clock.create_timer(self)
+        self.timer.timeout.connect(self.refresh)
+        config.signals.calendars_changed.connect(self.refresh)
+        config.signals.calendar_lead_minutes_changed.connect(self.refresh)
+
+    def start(self):
+        """Read the calendars for the first time, at the next event loop turn."""
+        if self._started:
+            return
+        self._started = True
+        self.clock.single_shot(0, self.refresh)
+
+    def refresh(self, *_):
+        """Bring the calendar reminders up to date with the files and the window starting now."""
+        if not self._started:
+            return
+        calendars = list(self.config.calendars)
+        if calendars:
+            self.timer.start(CALENDAR_REFRESH_MS)
+        else:
+            self.timer.stop()
+            if self.index is None:
+                self._apply(set())  # nothing was ever read, so there is nothing to forget either
+                return
+        if self._worker is not None and self._worker.is_alive():
+            self._refresh_pending = True  # its result is out of date; run again once it is in
+            return
+        lead = timedelta(minutes=self.config.calendar_lead_minutes)
+        self._worker = threading.Thread(
+            target=self._expand, args=(calendars, lead, self.clock.now()), name="calendar-feed", daemon=True
+        )
+        self._worker.start()
+
+    def restore(self, *_):
+        """Add all the calendar reminders again, after ReminderEngine.set_reminders() replaced them."""
+        self._reminder_ids = {}
+        self.refresh()
+
+    def _expand(self, calendars, lead, now):
+        """Worker thread: the reminders the calendars call for in the window starting at now."""
+        try:
+            if self.index is None:
+                self.index = CalendarIndex(self.index_path)
+            self.index.retain(calendars)
+            wanted = set()
+            for path in calendars:
+                try:
+                    events = self.index.events(path, now)
+                except OSError as e:
+                    logging.warning(f"Can't read calendar {path}: {e}")
+                    continue
+                for event in events:
+                    for start in event.occurrences(now, now + CALENDAR_WINDOW):
+                        if lead and start - lead > now:
+                            wanted.add((event.summary, start - lead, False))
+                        if start > now:
+                            wanted.add((event.summary, start, True))
+        except Exception:
+            logging.exception("Reading the calendars failed")
+            wanted = None
+        self._expanded.emit(wanted)
+
+    def _apply(self, wanted):
+        """
+        Add and remove the reminders that appeared or went away. One whose time has come is
+        left to fire, and none is added for a time that passed while the worker ran.
+        """
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self.refresh()
+            return
+        if wanted is None:
+            return
+        now = self.clock.now()
+        for key in [key for key in self._reminder_ids if key not in wanted]:
+            reminder_id = self._reminder_ids.pop(key)
+            if key[1] > now:
+                self.reminders.remove(reminder_id)
+        added = [key for key in wanted if key not in self._reminder_ids and key[1] > now]
+        reminders = [Reminder(summary, at=at, announce=announce) for summary, at, announce in added]
+        self._reminder_ids.update(zip(added, self.reminders.add_all(reminders)))
+
+    def _flush_index(self):
+        if self.index is not None:
+            self.index.store.flush()
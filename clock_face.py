@@ -0,0 +1,220 @@
+import time
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QRect, QSize
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPixmap
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+from instrumentation import Instrumentation
+
+DIGITS = "0123456789"
+CELL_CACHE_SIZE = 512
+
+
+_widest_digits = {}  # font family -> digit with the largest advance
+
+
+def widest_digit(family):
+    """Return the digit that sets the tabular cell width for a font family."""
+    if family not in _widest_digits:
+        metrics = QFontMetrics(QFont(family, 100))
+        _widest_digits[family] = max(DIGITS, key=metrics.horizontalAdvance)
+    return _widest_digits[family]
+
+
+class ClockFormatter:
+    """
+    Builds the clock strings from lookup tables instead of strftime.
+
+    Time fields come from precomputed two-digit tables (with separate 12h hour and AM/PM
+    tables), and the date string is only re-formatted when the calendar date changes.
+    """
+
+    _two_digits = [f"{i:02d}" for i in range(60)]
+    _hours_12 = [f"{(hour % 12) or 12:02d}" for hour in range(24)]
+    _am_pm = ["AM"] * 12 + ["PM"] * 12
+
+    def __init__(self):
+        self._date = None
+        self._date_text = ""
+
+    def time_text(self, now, toggle_24h):
+        """Equivalent to strftime("%H:%M:%S") or strftime("%I:%M:%S %p")."""
+        minutes_seconds = f"{self._two_digits[now.minute]}:{self._two_digits[now.second]}"
+        if toggle_24h:
+            return f"{self._two_digits[now.hour]}:{minutes_seconds}"
+        return f"{self._hours_12[now.hour]}:{minutes_seconds} {self._am_pm[now.hour]}"
+
+    def date_text(self, now):
+        """Equivalent to strftime("%A, %B %d, %Y"), formatted once per day."""
+        date = now.date()
+        if date != self._date:
+            self._date = date
+            self._date_text = now.strftime("%A, %B %d, %Y")
+        return self._date_text
+
+
+class ScaledPreview(QWidget):
+    """
+    Stand-in for the clock faces during an interactive resize.
+
+    Shows a snapshot of the clock scaled uniformly to the current size, the way a refit
+    would scale the fonts, so dragging the window edge costs one pixmap blit per frame.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self._pixmap = QPixmap()
+        self._background = QColor(Qt.black)
+
+    def set_snapshot(self, pixmap, background):
+        self._pixmap = pixmap
+        self._background = QColor(background)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self._background)
+        if not self._pixmap.isNull():
+            size = self._pixmap.size() / self._pixmap.devicePixelRatioF()
+            scale = min(self.width() / max(size.width(), 1), self.height() / max(size.height(), 1))
+            target = QRect(0, 0, int(size.width() * scale), int(size.height() * scale))
+            target.moveCenter(self.rect().center())
+            painter.drawPixmap(target, self._pixmap)
+        painter.end()
+
+
+class ClockFace(QWidget):
+    """
+    Single line of clock text drawn from pre-rasterized character cells.
+
+    Every character is rendered once per font, color and device pixel ratio into a cell
+    pixmap shared by all faces. Digits share one cell width, so a new time never moves
+    the layout and setText only invalidates the cells whose character changed; the
+    widget paints its own background inside those cells and nowhere else.
+    """
+
+    _cells = OrderedDict()  # (font key, rgba, device pixel ratio, char, cell width) -> QPixmap
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)  # we fill every pixel we repaint ourselves
+        self.setSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.MinimumExpanding)
+        self._text = ""
+        self._text_color = QColor(Qt.white)
+        self._background = QColor(Qt.black)
+        self._widths = []  # cell width of each character of _text
+        self._positions = []  # x of each cell relative to the text origin
+        self._text_width = 0
+        self.instruments = Instrumentation()
+        self._update_metrics()
+
+    def text(self):
+        return self._text
+
+    def setText(self, text):
+        """Show text, repainting only the cells that differ from the current text."""
+        if text == self._text:
+            return
+        old_text, old_widths = self._text, self._widths
+        self._text = text
+        self._layout()
+
+        if self._widths != old_widths:
+            # Different cell layout (new date, AM/PM width change): repaint the whole face
+            self.updateGeometry()
+            self.update()
+            return
+        for i, (old, new) in enumerate(zip(old_text, text)):
+            if old != new:
+                self.update(self._cell_rect(i))
+
+    def setFont(self, font):
+        super().setFont(font)
+        self._update_metrics()
+        self._layout()
+        self.updateGeometry()
+        self.update()
+
+    def set_text_color(self, color):
+        self._text_color = QColor(color)
+        self.update()
+
+    def set_background_color(self, color):
+        if color != self._background:
+            self._background = QColor(color)
+            self.update()
+
+    def sizeHint(self):
+        return QSize(self._text_width, self._height)
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def paintEvent(self, event):
+        start = time.perf_counter() if self.instruments.enabled else None
+        painter = QPainter(self)
+        for rect in event.region().rects():
+            painter.fillRect(rect, self._background)
+
+        dirty = event.rect()
+        x, y = self._origin()
+        for char, position, width in zip(self._text, self._positions, self._widths):
+            rect = QRect(x + position, y, width, self._height)
+            if rect.intersects(dirty):
+                painter.drawPixmap(rect.topLeft(), self._cell(char, width))
+        painter.end()
+        if start is not None:
+            self.instruments.record("paint.face", (time.perf_counter() - start) * 1000)
+
+    def _update_metrics(self):
+        font = self.font()
+        self._metrics = QFontMetrics(font)
+        self._font_key = font.key()
+        self._height = self._metrics.height()
+        # Tabular digits: every digit gets the widest digit's advance so cells never shift
+        self._digit_width = max(self._metrics.horizontalAdvance(d) for d in DIGITS)
+
+    def _layout(self):
+        self._widths = [
+            self._digit_width if char in DIGITS else self._metrics.horizontalAdvance(char)
+            for char in self._text
+        ]
+        self._positions = []
+        x = 0
+        for width in self._widths:
+            self._positions.append(x)
+            x += width
+        self._text_width = x
+
+    def _origin(self):
+        """Top-left of the text, centered in the widget."""
+        return (self.width() - self._text_width) // 2, (self.height() - self._height) // 2
+
+    def _cell_rect(self, i):
+        x, y = self._origin()
+        return QRect(x + self._positions[i], y, self._widths[i], self._height)
+
+    def _cell(self, char, width):
+        """Return the transparent pixmap for one character, rendering it on first use."""
+        ratio = self.devicePixelRatioF()
+        key = (self._font_key, self._text_color.rgba(), ratio, char, width)
+        pixmap = self._cells.get(key)
+        if pixmap is not None:
+            self._cells.move_to_end(key)
+            return pixmap
+
+        pixmap = QPixmap(max(int(width * ratio), 1), max(int(self._height * ratio), 1))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setFont(self.font())
+        painter.setPen(self._text_color)
+        x = (width - self._metrics.horizontalAdvance(char)) // 2
+        painter.drawText(x, self._metrics.ascent(), char)
+        painter.end()
+
+        self._cells[key] = pixmap
+        if len(self._cells) > CELL_CACHE_SIZE:
+            self._cells.popitem(last=False)
+        return pixmap
@@ -0,0 +1,77 @@
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+
+SAVE_DELAY_S = 0.5  # writes arriving within this window are coalesced into one
+
+
+class ConfigStore:
+    """
+    Settings file backend for AppConfig.
+
+    Settings are stored as compact JSON. Saves are debounced: every call replaces the
+    pending snapshot and restarts a short timer, and the timer thread writes the latest
+    snapshot to a temporary file that is then renamed over the real one, so the GUI
+    thread never blocks on disk and a crash never leaves a half-written file.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = None
+        self._timer = None
+
+    def load(self):
+        """Return the stored settings as a dict, or None if there is no usable file."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable settings file {self.path}: {e}")
+            return None
+        return data if isinstance(data, dict) else None
+
+    def schedule_save(self, data):
+        """Queue a snapshot to be written after SAVE_DELAY_S, replacing any queued one."""
+        with self._lock:
+            self._pending = data
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(SAVE_DELAY_S, self._write_pending)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write any queued snapshot right away, e.g. when the application quits."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._write_pending()
+
+    def _write_pending(self):
+        with self._write_lock:
+            with self._lock:
+                data, self._pending = self._pending, None
+            if data is None:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".settings-", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(data, f, separators=(",", ":"))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            except OSError as e:
+                logging.error(f"Failed to save settings to {self.path}: {e}")
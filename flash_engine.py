@@ -0,0 +1,116 @@
+import math
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QEasingCurve, pyqtSignal
+from PyQt5.QtGui import QColor
+from time_source import SystemClock
+
+try:
+    import numpy as np
+except ImportError:  # the plain-list ramp is used instead
+    np = None
+
+FRAME_INTERVAL_MS = 16
+RAMP_CACHE_SIZE = 8
+
+
+class FlashRamp:
+    """
+    Every color of one flash loop, precomputed.
+
+    A loop fades from the start color to the end color over duration_ms with the given
+    easing, then jumps back, exactly like a looping QPropertyAnimation on a QColor. The
+    ramp holds one entry per frame so playback is a table lookup.
+    """
+
+    _ramps = OrderedDict()  # (start rgba, end rgba, duration ms, easing type) -> FlashRamp
+
+    def __init__(self, start, end, duration_ms, easing_type):
+        self.duration_ms = max(int(duration_ms), 1)
+        self.frame_count = max(math.ceil(self.duration_ms / FRAME_INTERVAL_MS), 1)
+
+        curve = QEasingCurve(easing_type)
+        progress = [curve.valueForProgress(i / self.frame_count) for i in range(self.frame_count)]
+        start_rgba = (start.red(), start.green(), start.blue(), start.alpha())
+        end_rgba = (end.red(), end.green(), end.blue(), end.alpha())
+
+        if np is not None:
+            p = np.asarray(progress)[:, None]
+            channels = np.rint(np.asarray(start_rgba) + (np.asarray(end_rgba) - np.asarray(start_rgba)) * p)
+            channels = np.clip(channels, 0, 255).astype(np.uint32)
+            rgba = (channels[:, 3] << 24) | (channels[:, 0] << 16) | (channels[:, 1] << 8) | channels[:, 2]
+            self.rgba = rgba.tolist()
+        else:
+            self.rgba = []
+            for t in progress:
+                r, g, b, a = (min(max(round(s + (e - s) * t), 0), 255) for s, e in zip(start_rgba, end_rgba))
+                self.rgba.append((a << 24) | (r << 16) | (g << 8) | b)
+        self.colors = [QColor.fromRgba(value) for value in self.rgba]
+
+    @classmethod
+    def get(cls, start, end, duration_ms, easing_type):
+        """Return the shared ramp for these parameters, computing it on first use."""
+        key = (start.rgba(), end.rgba(), int(duration_ms), int(easing_type))
+        ramp = cls._ramps.get(key)
+        if ramp is None:
+            ramp = cls(start, end, duration_ms, easing_type)
+            cls._ramps[key] = ramp
+            if len(cls._ramps) > RAMP_CACHE_SIZE:
+                cls._ramps.popitem(last=False)
+        else:
+            cls._ramps.move_to_end(key)
+        return ramp
+
+    def index_at(self, elapsed_ms):
+        """Frame index for a point in time, looping every duration_ms."""
+        return (elapsed_ms % self.duration_ms) * self.frame_count // self.duration_ms
+
+
+class FlashEngine(QObject):
+    """
+    Plays a FlashRamp on a frame clock.
+
+    Frames are derived from the clock's elapsed time, so a late timer skips ahead
+    rather than slowing the flash down, and a frame whose color equals the previous one
+    is not emitted at all.
+    """
+
+    frame = pyqtSignal(QColor)
+    finished = pyqtSignal()
+
+    def __init__(self, parent=None, clock=None):
+        super().__init__(parent)
+        self.clock = clock or SystemClock()
+        self._timer = self.clock.create_timer(self)
+        self._timer.setInterval(FRAME_INTERVAL_MS)
+        self._timer.timeout.connect(self._on_frame)
+        self._started_ms = 0
+        self._ramp = None
+        self._total_ms = 0
+        self._last_rgba = None
+
+    def is_running(self):
+        return self._timer.isActive()
+
+    def start(self, ramp, loops):
+        """Play ramp the given number of times."""
+        self._ramp = ramp
+        self._total_ms = ramp.duration_ms * max(int(loops), 1)
+        self._last_rgba = None
+        self._started_ms = self.clock.monotonic_ms()
+        self._timer.start()
+        self._on_frame()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _on_frame(self):
+        elapsed = self.clock.monotonic_ms() - self._started_ms
+        if elapsed >= self._total_ms:
+            self._timer.stop()
+            self.finished.emit()
+            return
+        index = self._ramp.index_at(elapsed)
+        rgba = self._ramp.rgba[index]
+        if rgba != self._last_rgba:
+            self._last_rgba = rgba
+            self.frame.emit(self._ramp.colors[index])
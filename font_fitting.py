@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from PyQt5.QtGui import QFont, QFontMetrics
+
+MIN_FONT_SIZE = 1
+MAX_FONT_SIZE = 8000  # arbitrary upper limit
+REFERENCE_FONT_SIZE = 100  # size measured once per text to extrapolate a first guess
+FIT_CACHE_SIZE = 256
+# A fit takes a dozen or so probes; this keeps those of the recent fits, including the
+# measurements at the current sizes that a resize extrapolates from
+METRIC_CACHE_SIZE = 4096
+
+
+class FontFitter:
+    """
+    Finds the largest point size at which a text fits a box.
+
+    Text extents grow almost linearly with point size, so a single measurement at a
+    reference size gives a close first guess. When the caller knows an earlier fit (a
+    resize), the measurement at that size is used instead: it is already cached and,
+    being close to the answer, the guess is usually confirmed by two probes. The guess
+    is then bracketed and bisected to absorb hinting and rounding effects. Fitted sizes
+    and individual measurements are cached at class level so every label (and every
+    window) shares them.
+    """
+
+    _fit_cache = OrderedDict()  # (family, text, width, height) -> point size
+    _metric_cache = OrderedDict()  # (family, text, point size) -> (width, height)
+
+    @classmethod
+    def measure(cls, family, text, size):
+        """Return the (width, height) of text rendered at the given point size."""
+        key = (family, text, size)
+        extent = cls._metric_cache.get(key)
+        if extent is not None:
+            cls._metric_cache.move_to_end(key)
+            return extent
+        fm = QFontMetrics(QFont(family, size))
+        extent = (fm.horizontalAdvance(text), fm.height())
+        cls._metric_cache[key] = extent
+        if len(cls._metric_cache) > METRIC_CACHE_SIZE:
+            cls._metric_cache.popitem(last=False)
+        return extent
+
+    @classmethod
+    def fits(cls, family, text, size, max_width, max_height):
+        width, height = cls.measure(family, text, size)
+        return width <= max_width and height <= max_height
+
+    @classmethod
+    def fit(cls, family, text, max_width, max_height, near=None):
+        """
+        Return the largest point size at which text fits within max_width x max_height.
+
+        near is an optional nearby point size, such as the fit before a resize, to
+        extrapolate from instead of REFERENCE_FONT_SIZE.
+        """
+        key = (family, text, int(max_width), int(max_height))
+        size = cls._fit_cache.get(key)
+        if size is not None:
+            cls._fit_cache.move_to_end(key)
+            return size
+
+        size = cls._search(family, text, max_width, max_height, near or REFERENCE_FONT_SIZE)
+        cls._fit_cache[key] = size
+        if len(cls._fit_cache) > FIT_CACHE_SIZE:
+            cls._fit_cache.popitem(last=False)
+        return size
+
+    @classmethod
+    def clear(cls):
+        """Drop all cached fits and measurements, e.g. after the font set changes."""
+        cls._fit_cache.clear()
+        cls._metric_cache.clear()
+
+    @classmethod
+    def _search(cls, family, text, max_width, max_height, ref_size=REFERENCE_FONT_SIZE):
+        ref_width, ref_height = cls.measure(family, text, ref_size)
+        scale = min(max_width / max(ref_width, 1), max_height / max(ref_height, 1))
+        guess = min(max(int(ref_size * scale), MIN_FONT_SIZE), MAX_FONT_SIZE)
+
+        def fits(size):
+            return cls.fits(family, text, size, max_width, max_height)
+
+        # Gallop away from the guess until the answer is bracketed by lo (fits) and hi (too big)
+        step = 1
+        if fits(guess):
+            lo, hi = guess, guess + 1
+            while hi <= MAX_FONT_SIZE and fits(hi):
+                lo, step = hi, step * 2
+                hi = guess + step
+            hi = min(hi, MAX_FONT_SIZE + 1)
+        else:
+            lo, hi = guess - 1, guess
+            while lo >= MIN_FONT_SIZE and not fits(lo):
+                hi, step = lo, step * 2
+                lo = guess - step
+            if lo < MIN_FONT_SIZE:
+                if not fits(MIN_FONT_SIZE):
+                    return MIN_FONT_SIZE  # nothing fits, fall back to the smallest size
+                lo = MIN_FONT_SIZE
+
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if fits(mid):
+                lo = mid
+            else:
+                hi = mid
+        return lo
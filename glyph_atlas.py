@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPixmap
+
+HUE_STEPS = 16
+
+# A sine table to give dy, the change in y coordinate, giving the text a wiggling effect
+SINE_TABLE = [0, 38, 71, 92, 100, 92, 71, 38, 0, -38, -71, -92, -100, -92, -71, -38]
+
+ATLAS_CACHE_SIZE = 2  # atlases are several MB each at announcement sizes
+
+
+class GlyphAtlas:
+    """
+    Pre-rendered glyphs of one font for the wiggling announcement.
+
+    Every character is rasterized once per hue step into its own pixmap, so painting a
+    frame is a series of pixmap blits at precomputed sine offsets instead of per-character
+    font shaping, color allocation and text drawing.
+    """
+
+    _atlases = OrderedDict()  # (family, point size, device pixel ratio) -> GlyphAtlas
+
+    def __init__(self, family, point_size, device_pixel_ratio=1.0):
+        self.font = QFont()
+        self.font.setFamily(family)
+        self.font.setPointSize(point_size)
+        self.font.setBold(False)
+        self.font.setItalic(False)
+        self.metrics = QFontMetrics(self.font)
+        self.device_pixel_ratio = device_pixel_ratio
+
+        # dy in pixels for each step of the sine table
+        self.offsets = [(dy * self.metrics.height()) // 400 for dy in SINE_TABLE]
+        self.colors = [QColor.fromHsv((HUE_STEPS - 1 - i) * 16, 255, 191) for i in range(HUE_STEPS)]
+
+        self._glyphs = {}  # (char, hue step) -> (pixmap, x offset, y offset) or None for blanks
+        self._layouts = {}  # text -> (x position of each char, total advance)
+
+    @classmethod
+    def for_font(cls, family, point_size, device_pixel_ratio=1.0):
+        """Return the shared atlas for a font, building it on first use."""
+        key = (family, point_size, device_pixel_ratio)
+        atlas = cls._atlases.get(key)
+        if atlas is None:
+            atlas = cls(family, point_size, device_pixel_ratio)
+            cls._atlases[key] = atlas
+            if len(cls._atlases) > ATLAS_CACHE_SIZE:
+                cls._atlases.popitem(last=False)
+        else:
+            cls._atlases.move_to_end(key)
+        return atlas
+
+    def prepare(self, text):
+        """Rasterize every glyph of text in every hue step ahead of the first frame."""
+        for char in set(text):
+            for index in range(HUE_STEPS):
+                self.glyph(char, index)
+        self.layout(text)
+
+    def retain(self, texts):
+        """Drop rendered glyphs that none of the given texts use, to bound memory."""
+        keep = set("".join(texts))
+        self._glyphs = {key: glyph for key, glyph in self._glyphs.items() if key[0] in keep}
+
+    def layout(self, text):
+        """Return the x position of each character relative to the start, and the total advance."""
+        layout = self._layouts.get(text)
+        if layout is None:
+            positions = []
+            x = 0
+            for char in text:
+                positions.append(x)
+                x += self.metrics.horizontalAdvance(char)
+            layout = (positions, x)
+            self._layouts[text] = layout
+        return layout
+
+    def glyph(self, char, index):
+        """Return (pixmap, dx, dy) placing char relative to its baseline origin, or None if blank."""
+        key = (char, index)
+        if key not in self._glyphs:
+            self._glyphs[key] = self._render(char, self.colors[index])
+        return self._glyphs[key]
+
+    def _render(self, char, color):
+        rect = self.metrics.boundingRect(char)
+        if rect.isEmpty():
+            return None
+        rect.adjust(-1, -1, 1, 1)  # room for antialiasing
+
+        ratio = self.device_pixel_ratio
+        pixmap = QPixmap(int(rect.width() * ratio), int(rect.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setFont(self.font)
+        painter.setPen(color)
+        painter.drawText(-rect.x(), -rect.y(), char)
+        painter.end()
+        return pixmap, rect.x(), rect.y()
@@ -0,0 +1,158 @@
+import logging
+
+LOG_INTERVAL_MS = 60_000  # how often the summary line is logged
+RING_SIZE = 256  # recent samples kept per metric for the overlay
+
+# Histogram buckets: values below 2**(SUB_BUCKET_BITS + 1) us are exact, above that each
+# power of two is split into 2**SUB_BUCKET_BITS buckets (at most 1/16 = 6.25% error)
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+EXACT_LIMIT = SUB_BUCKETS * 2
+MAX_VALUE_US = (1 << 31) - 1  # ~35 minutes; anything longer is clamped
+BUCKET_COUNT = EXACT_LIMIT + (MAX_VALUE_US.bit_length() - SUB_BUCKET_BITS - 1) * SUB_BUCKETS
+
+
+class LogHistogram:
+    """
+    Fixed-size histogram of microsecond values in log-linear (HDR-style) buckets.
+
+    Recording is one index computation and one increment, and memory stays constant no
+    matter how many samples are recorded.
+    """
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.max_us = 0
+
+    def record(self, value_us):
+        value_us = min(max(int(value_us), 0), MAX_VALUE_US)
+        self.counts[self._index(value_us)] += 1
+        self.count += 1
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-quantile (0 <= q <= 1), in microseconds."""
+        if not self.count:
+            return 0
+        target = max(int(q * self.count + 0.5), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._upper_bound(index), self.max_us)
+        return self.max_us
+
+    def reset(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.max_us = 0
+
+    @staticmethod
+    def _index(value_us):
+        if value_us < EXACT_LIMIT:
+            return value_us
+        shift = value_us.bit_length() - SUB_BUCKET_BITS - 1
+        return EXACT_LIMIT + (shift - 1) * SUB_BUCKETS + (value_us >> shift) - SUB_BUCKETS
+
+    @staticmethod
+    def _upper_bound(index):
+        if index < EXACT_LIMIT:
+            return index
+        shift, sub = divmod(index - EXACT_LIMIT, SUB_BUCKETS)
+        shift += 1
+        return ((sub + SUB_BUCKETS + 1) << shift) - 1
+
+
+class RingBuffer:
+    """The last `size` values appended, oldest first when iterated."""
+
+    def __init__(self, size):
+        self._values = [0.0] * size
+        self._next = 0
+        self._count = 0
+
+    def append(self, value):
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        self._count = min(self._count + 1, len(self._values))
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        start = (self._next - self._count) % len(self._values)
+        for i in range(self._count):
+            yield self._values[(start + i) % len(self._values)]
+
+    def latest(self):
+        return self._values[self._next - 1] if self._count else 0.0
+
+
+class Metric:
+    """One measured quantity: recent samples, a histogram since the last log line and one since startup."""
+
+    def __init__(self, name):
+        self.name = name
+        self.recent = RingBuffer(RING_SIZE)
+        self.window = LogHistogram()
+        self.total = LogHistogram()
+
+    def record(self, ms):
+        self.recent.append(ms)
+        self.window.record(ms * 1000)
+        self.total.record(ms * 1000)
+
+    def summary(self, histogram):
+        return (
+            f"{self.name} n={histogram.count} p50={histogram.percentile(0.5) / 1000:.1f} "
+            f"p99={histogram.percentile(0.99) / 1000:.1f} max={histogram.max_us / 1000:.1f}"
+        )
+
+
+class Instrumentation:
+    """
+    Singleton collecting timing metrics: tick lateness, paint durations, flash start skew.
+
+    Disabled by default; call sites check `enabled` before taking any timestamp, so the
+    cost when off is one attribute lookup. Enabled with --instrument (periodic log line)
+    or --overlay (also shown live in the title bar). All values are in ms.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.init_instrumentation()
+        return cls._instance
+
+    def init_instrumentation(self):
+        self.enabled = False
+        self.overlay = False
+        self.metrics = {}  # name -> Metric, in order of first record
+
+    def enable(self, overlay=False):
+        self.enabled = True
+        self.overlay = overlay
+
+    def record(self, name, ms):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = Metric(name)
+        metric.record(ms)
+
+    def log_summary(self):
+        """Log one compact line covering the samples recorded since the previous one."""
+        parts = [metric.summary(metric.window) for metric in self.metrics.values() if metric.window.count]
+        if parts:
+            logging.info("timings (ms): " + " | ".join(parts))
+        for metric in self.metrics.values():
+            metric.window.reset()
+
+    def overlay_text(self):
+        """Latest and worst recent value of every metric, short enough for the title bar."""
+        return "  ".join(
+            f"{metric.name} {metric.recent.latest():.1f}/{max(metric.recent):.1f}"
+            for metric in self.metrics.values() if len(metric.recent)
+        )
@@ -0,0 +1,327 @@
+import bisect
+import heapq
+import itertools
+import logging
+from datetime import datetime, timedelta
+from PyQt5.QtCore import QObject, pyqtSignal
+from time_source import SystemClock
+from tick_scheduler import MISSED_EVENT_GRACE, TICK_SLACK_MS
+
+# Far-off deadlines are approached in steps of at most this long, which also keeps the
+# delay within QTimer's range and lets a drifting wall clock be caught up with
+MAX_ARM_MS = 60 * 60 * 1000
+# A cron expression matching nothing within this many years never fires (e.g. "0 0 30 2 *")
+CRON_SEARCH_YEARS = 8
+# Removed reminders stay in the heap until it holds more than this many stale entries per live one
+STALE_ENTRY_RATIO = 1
+
+CRON_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+# (first, last) value of each cron field: minute, hour, day of month, month, day of week (0 or 7 is Sunday)
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+class CronSchedule:
+    """
+    A standard five-field cron expression: minute, hour, day of month, month, day of week.
+
+    Each field is "*", a number, a range "a-b", a step "*/n" or "a-b/n", or a comma
+    separated list of those; the @hourly/@daily/... aliases are understood too. As in
+    cron, when both the day of month and the day of week are restricted, a day matching
+    either one matches. Raises ValueError for an expression it can't parse.
+    """
+
+    def __init__(self, expression):
+        self.expression = expression
+        fields = CRON_ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expression!r}")
+        minutes, hours, days, months, weekdays = (
+            self._parse_field(field, first, last) for field, (first, last) in zip(fields, CRON_FIELDS)
+        )
+        self.minutes = sorted(minutes)
+        self.hours = sorted(hours)
+        self.days = days
+        self.months = months
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse_field(field, first, last):
+        values = set()
+        for part in field.split(","):
+            value_range, _, step = part.partition("/")
+            if value_range == "*":
+                start, end = first, last
+            elif "-" in value_range:
+                start, end = (int(v) for v in value_range.split("-", 1))
+            else:
+                start = end = int(value_range)
+            if not first <= start <= end <= last:
+                raise ValueError(f"cron field {field!r} is outside {first}-{last}")
+            step = int(step) if step else 1
+            if step < 1:
+                raise ValueError(f"cron step must be positive in {field!r}")
+            if step > 1 and value_range != "*" and "-" not in value_range:
+                end = last  # "5/15" means from 5 on, every 15
+            values.update(range(start, end + 1, step))
+        return values
+
+    def day_matches(self, day):
+        in_month = day.day in self.days
+        # isoweekday() is 1 (Monday) to 7 (Sunday); cron counts from 0 (Sunday)
+        in_week = day.isoweekday() % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_after(self, after):
+        """The first matching minute strictly after the datetime after, or None if there is none."""
+        t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        give_up = t.year + CRON_SEARCH_YEARS
+        while t.year < give_up:
+            if t.month not in self.months:
+                year, month = (t.year + 1, 1) if t.month == 12 else (t.year, t.month + 1)
+                t = datetime(year, month, 1)
+                continue
+            if not self.day_matches(t):
+                t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                continue
+            i = bisect.bisect_left(self.hours, t.hour)
+            if i == len(self.hours):
+                t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                continue
+            if self.hours[i] != t.hour:
+                t = t.replace(hour=self.hours[i], minute=0)
+            i = bisect.bisect_left(self.minutes, t.minute)
+            if i == len(self.minutes):
+                t = t.replace(minute=0) + timedelta(hours=1)
+                continue
+            return t.replace(minute=self.minutes[i])
+        return None
+
+
+class Reminder:
+    """
+    One reminder: a cron schedule or a one-off time, and how it shows.
+
+    color, duration (seconds of flashing) and sound (path of a short sound effect) are
+    optional; a reminder without them flashes like the regular flash. An announcing
+    reminder shows its name on the wiggle screen instead of flashing. Stored in the
+    settings file as a dict, see from_dict().
+    """
+
+    def __init__(self, name, schedule=None, at=None, color=None, duration=None, sound=None, announce=False):
+        if (schedule is None) == (at is None):
+            raise ValueError(f"reminder {name!r} needs either a schedule or an 'at' time")
+        self.name = name
+        self.schedule = CronSchedule(schedule) if isinstance(schedule, str) else schedule
+        self.at = at
+        self.color = color
+        self.duration = duration
+        self.sound = sound
+        self.announce = announce
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a reminder from its settings form, e.g. {"name": "stand up", "schedule": "*/50 9-17 * * 1-5",
+        "color": "#40a0ff", "duration": 3, "sound": "chime.wav"} or {"name": "call", "at": "2024-05-01T14:30"}."""
+        at = data.get("at")
+        return cls(
+            data.get("name", ""),
+            schedule=data.get("schedule"),
+            at=datetime.fromisoformat(at) if at else None,
+            color=data.get("color"),
+            duration=data.get("duration"),
+            sound=data.get("sound"),
+            announce=bool(data.get("announce", False)),
+        )
+
+    def to_dict(self):
+        data = {"name": self.name}
+        if self.schedule is not None:
+            data["schedule"] = self.schedule.expression
+        else:
+            data["at"] = self.at.isoformat()
+        for key in ("color", "duration", "sound"):
+            if getattr(self, key) is not None:
+                data[key] = getattr(self, key)
+        if self.announce:
+            data["announce"] = True
+        return data
+
+    def next_after(self, after):
+        """The next time this reminder fires after the datetime after, or None if it never will again."""
+        if self.schedule is not None:
+            return self.schedule.next_after(after)
+        return self.at if self.at > after else None
+
+
+class ReminderEngine(QObject):
+    """
+    Fires reminders at their deadlines from a min-heap of (deadline, reminder).
+
+    Only the nearest deadline has a timer armed, so the engine costs nothing between
+    reminders however many there are: adding or removing one is O(log n) and firing
+    one pops it and pushes its next occurrence. Removed reminders are dropped lazily
+    when they reach the top of the heap. Nothing runs on the clock's per-second ticks.
+
+    Reminders overdue by more than MISSED_EVENT_GRACE (after a suspend or a clock jump)
+    fire once unless the config's missed_event_policy is "skip"; recurring ones then
+    continue from the current time, never with a burst of the occurrences missed.
+    Connect TickScheduler.time_jumped to replan() so deadlines follow clock changes.
+    """
+
+    reminder_due = pyqtSignal(object)  # the Reminder
+
+    def __init__(self, config, parent=None, clock=None):
+        super().__init__(parent)
+        self.config = config
+        self.clock = clock or SystemClock()
+        self._reminders = {}  # id -> Reminder
+        self._heap = []  # (deadline, sequence, id)
+        self._deadlines = {}  # id -> deadline of its live heap entry
+        self._ids = itertools.count()
+        self._sequence = itertools.count()
+        self.fired_deadline = None  # deadline of the reminder being emitted, for skew measurements
+
+        self._timer = self.clock.create_timer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timer)
+
+    def __len__(self):
+        return len(self._reminders)
+
+    def add(self, reminder):
+        """Schedule a reminder and return its id, for remove()."""
+        reminder_id = next(self._ids)
+        self._reminders[reminder_id] = reminder
+        if self._push(reminder_id, self.clock.now()):
+            self._arm()
+        return reminder_id
+
+    def add_all(self, reminders):
+        """Schedule several reminders with one heapify and one timer update; returns their ids in order."""
+        now = self.clock.now()
+        ids = []
+        for reminder in reminders:
+            reminder_id = next(self._ids)
+            self._reminders[reminder_id] = reminder
+            self._push(reminder_id, now, heapify=False)
+            ids.append(reminder_id)
+        heapq.heapify(self._heap)
+        self._arm()
+        return ids
+
+    def remove(self, reminder_id):
+        if self._reminders.pop(reminder_id, None) is None:
+            return
+        deadline = self._deadlines.pop(reminder_id, None)
+        if len(self._heap) > (1 + STALE_ENTRY_RATIO) * len(self._deadlines):
+            self._rebuild()
+        elif self._heap and deadline == self._heap[0][0]:
+            self._arm()
+
+    def set_reminders(self, reminders):
+        """Replace all reminders with the given Reminder objects or settings dicts."""
+        self._reminders = {}
+        self._deadlines = {}
+        for reminder in reminders:
+            if isinstance(reminder, dict):
+                try:
+                    reminder = Reminder.from_dict(reminder)
+                except (ValueError, TypeError) as e:
+                    logging.warning(f"Ignoring reminder {reminder!r}: {e}")
+                    continue
+            self._reminders[next(self._ids)] = reminder
+        self.replan()
+
+    def replan(self, *_):
+        """
+        Recompute the deadlines from the current time, e.g. after the wall clock jumped.
+        Deadlines the clock has already passed are kept, so the missed event policy decides
+        whether they still fire.
+        """
+        now = self.clock.now()
+        overdue = {reminder_id: deadline for reminder_id, deadline in self._deadlines.items() if deadline <= now}
+        self._heap = []
+        self._deadlines = {}
+        for reminder_id in list(self._reminders):
+            if reminder_id in overdue:
+                self._deadlines[reminder_id] = overdue[reminder_id]
+                self._heap.append((overdue[reminder_id], next(self._sequence), reminder_id))
+            else:
+                self._push(reminder_id, now, heapify=False)
+        heapq.heapify(self._heap)
+        self._arm()
+
+    def next_deadline(self):
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def stop(self):
+        self._timer.stop()
+
+    def _push(self, reminder_id, after, heapify=True):
+        """Queue the reminder's next deadline after the given time. Returns True if it is the new nearest."""
+        deadline = self._reminders[reminder_id].next_after(after)
+        if deadline is None:
+            # A one-off reminder in the past, or a schedule that never matches again
+            del self._reminders[reminder_id]
+            return False
+        self._deadlines[reminder_id] = deadline
+        entry = (deadline, next(self._sequence), reminder_id)
+        if heapify:
+            heapq.heappush(self._heap, entry)
+            return self._heap[0] is entry
+        self._heap.append(entry)
+        return False
+
+    def _rebuild(self):
+        self._heap = [(deadline, next(self._sequence), reminder_id) for reminder_id, deadline in self._deadlines.items()]
+        heapq.heapify(self._heap)
+        self._arm()
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def _arm(self):
+        """Arm the one timer for the nearest deadline, or stop it if there is none."""
+        deadline = self.next_deadline()
+        if deadline is None:
+            self._timer.stop()
+            return
+        delay_ms = int((deadline - self.clock.now()).total_seconds() * 1000) + TICK_SLACK_MS
+        self._timer.start(min(max(delay_ms, 0), MAX_ARM_MS))
+
+    def _on_timer(self):
+        now = self.clock.now()
+        due = []
+        self._drop_stale()
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, reminder_id = heapq.heappop(self._heap)
+            del self._deadlines[reminder_id]
+            due.append((deadline, self._reminders[reminder_id]))
+            self._push(reminder_id, now, heapify=True)
+            self._drop_stale()
+        self._arm()  # before emitting, so handlers always see the following deadline armed
+
+        skip_missed = self.config.missed_event_policy == "skip"
+        for deadline, reminder in due:
+            if now - deadline > MISSED_EVENT_GRACE:
+                if skip_missed:
+                    logging.info(f"Skipping reminder {reminder.name!r} missed since {deadline:%Y-%m-%d %H:%M}")
+                    continue
+                logging.info(f"Catching up on reminder {reminder.name!r} due at {deadline:%Y-%m-%d %H:%M}")
+            self.fired_deadline = deadline
+            self.reminder_due.emit(reminder)
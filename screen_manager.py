@@ -0,0 +1,128 @@
+import logging
+from PyQt5.QtCore import QObject, QRect, QTimer, pyqtSignal
+from PyQt5.QtGui import QGuiApplication
+
+SCREEN_SETTLE_MS = 250  # docking fires a burst of screen signals; react once it is over
+
+
+class ScreenSignals(QObject):
+    """Change notifications for ScreenManager."""
+    screens_changed = pyqtSignal()  # a screen was added or removed, or its geometry changed
+
+    def __init__(self):
+        super().__init__()
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(SCREEN_SETTLE_MS)
+        self.settle_timer.timeout.connect(self.screens_changed)
+
+
+class ScreenManager:
+    """
+    Singleton tracking the connected screens and where the clock belongs on them.
+
+    Subscribes to QGuiApplication's screen added/removed/primary-changed signals and to
+    each screen's geometry signals, and keeps every screen's geometry cached, so
+    placement never rescans the desktop. A burst of changes (docking, undocking,
+    rotating a display) is announced once through signals.screens_changed.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.init_screens()
+        return cls._instance
+
+    def init_screens(self):
+        self.signals = ScreenSignals()
+        self._geometries = {}  # screen name -> (geometry, available geometry)
+
+        app = QGuiApplication.instance()
+        app.screenAdded.connect(self._on_screen_added)
+        app.screenRemoved.connect(self._on_screen_removed)
+        app.primaryScreenChanged.connect(self._changed)
+        for screen in app.screens():
+            self._watch(screen)
+
+    def screens(self):
+        return QGuiApplication.screens()
+
+    def primary_screen(self):
+        return QGuiApplication.primaryScreen()
+
+    def clock_screen(self):
+        """The first extended (non-primary) screen, or the primary screen if it is the only one."""
+        primary = self.primary_screen()
+        extended = [screen for screen in self.screens() if screen is not primary]
+        return extended[0] if extended else primary
+
+    def resolve(self, choices):
+        """
+        The screens named by choices, in order and without repeats. A choice is a screen
+        index (in QGuiApplication.screens() order), a screen name, or "extended" for every
+        screen but the primary one. Choices matching no connected screen are left out.
+        """
+        screens = self.screens()
+        primary = self.primary_screen()
+        chosen = []
+        for choice in choices:
+            if choice == "extended":
+                matches = [screen for screen in screens if screen is not primary]
+            elif choice.isdigit():
+                index = int(choice)
+                matches = screens[index:index + 1]
+            else:
+                matches = [screen for screen in screens if screen.name() == choice]
+            chosen += [screen for screen in matches if screen not in chosen]
+        return chosen
+
+    def geometry(self, screen):
+        return self._cached(screen)[0]
+
+    def available_geometry(self, screen):
+        return self._cached(screen)[1]
+
+    def clock_geometry(self, strip_fraction, screen=None):
+        """
+        Where a clock window goes on screen (by default clock_screen()): all of an extended
+        screen, or a full-width strip strip_fraction of the screen high along the bottom of
+        the primary screen. Returns None if there is no screen at all.
+        """
+        if screen is None:
+            screen = self.clock_screen()
+        if screen is None:
+            return None
+        geometry = self.geometry(screen)
+        if screen is not self.primary_screen():
+            return QRect(geometry)
+        height = int(geometry.height() * strip_fraction)
+        return QRect(geometry.x(), geometry.bottom() + 1 - height, geometry.width(), height)
+
+    def _cached(self, screen):
+        name = screen.name()
+        if name not in self._geometries:
+            self._watch(screen)
+        return self._geometries[name]
+
+    def _watch(self, screen):
+        self._geometries[screen.name()] = (screen.geometry(), screen.availableGeometry())
+        screen.geometryChanged.connect(lambda _, screen=screen: self._on_geometry_changed(screen))
+        screen.availableGeometryChanged.connect(lambda _, screen=screen: self._on_geometry_changed(screen))
+
+    def _on_screen_added(self, screen):
+        logging.info(f"Screen added: {screen.name()} {screen.geometry().getRect()}")
+        self._watch(screen)
+        self._changed()
+
+    def _on_screen_removed(self, screen):
+        logging.info(f"Screen removed: {screen.name()}")
+        self._geometries.pop(screen.name(), None)
+        self._changed()
+
+    def _on_geometry_changed(self, screen):
+        self._geometries[screen.name()] = (screen.geometry(), screen.availableGeometry())
+        self._changed()
+
+    def _changed(self, *_):
+        self.signals.settle_timer.start()
@@ -0,0 +1,73 @@
+import logging
+import pathlib
+from PyQt5.QtCore import QUrl
+from PyQt5.QtMultimedia import QSoundEffect
+
+VOICES_PER_SOUND = 3  # how many copies of one sound may overlap
+
+
+class SoundPool:
+    """
+    Singleton pool of short sound effects shared by the whole process.
+
+    Each file is loaded once into a fixed set of QSoundEffect voices. Playing a sound
+    uses an idle voice, or steals the one started longest ago, so quick repeats overlap
+    instead of cutting each other off.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.init_pool()
+        return cls._instance
+
+    def init_pool(self):
+        self._voices = {}  # path -> list of QSoundEffect
+        self._next_voice = {}  # path -> index of the voice to steal next
+        self._directories = {}  # (directory, pattern) -> list of loaded paths
+
+    def load_directory(self, directory, pattern="*.wav"):
+        """Load every matching file in directory, scanning the directory only once."""
+        key = (str(directory), pattern)
+        if key not in self._directories:
+            paths = sorted(pathlib.Path(directory).glob(pattern))
+            self._directories[key] = [path for path in paths if self.load(path)]
+        return self._directories[key]
+
+    def load(self, path):
+        """Create the voices for one sound file. Returns False if the file is missing."""
+        path = pathlib.Path(path)
+        if path in self._voices:
+            return True
+        if not path.exists():
+            logging.error(f"Sound file not found: {path}")
+            return False
+
+        voices = []
+        for _ in range(VOICES_PER_SOUND):
+            sound = QSoundEffect()
+            sound.setSource(QUrl.fromLocalFile(str(path)))  # Qt decodes each file once and shares the samples
+            sound.setLoopCount(1)
+            voices.append(sound)
+        self._voices[path] = voices
+        self._next_voice[path] = 0
+        return True
+
+    def play(self, path, volume):
+        """Play a loaded sound at the given linear volume on a free (or the oldest) voice."""
+        path = pathlib.Path(path)
+        voices = self._voices.get(path)
+        if not voices:
+            logging.warning(f"Sound was never loaded: {path}")
+            return
+
+        # Voices are used in rotation, so the one after the last used is the oldest
+        start = self._next_voice[path]
+        rotation = voices[start:] + voices[:start]
+        voice = next((v for v in rotation if not v.isPlaying()), rotation[0])
+        self._next_voice[path] = (voices.index(voice) + 1) % len(voices)
+
+        voice.stop()
+        voice.setVolume(volume)
+        voice.play()
@@ -0,0 +1,51 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+# Taken at the first import of this module, which bigclock.py does before importing Qt
+PROCESS_T0 = time.perf_counter()
+
+
+class StartupProfiler:
+    """
+    Singleton recording named startup milestones and spans, in ms since PROCESS_T0.
+
+    Recording is always on (it costs a perf_counter call per mark); the report is only
+    printed when the app runs with --profile-startup.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.init_profile()
+        return cls._instance
+
+    def init_profile(self):
+        self.marks = {}  # name -> ms since start
+        self.spans = {}  # name -> duration in ms
+        self.enabled = False
+
+    def mark(self, name):
+        """Record the first time a milestone is reached."""
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - PROCESS_T0) * 1000
+
+    @contextmanager
+    def span(self, name):
+        """Record how long the enclosed block took."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] = self.spans.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def report(self):
+        """Log a readable summary and print a single JSON line for benchmark scripts."""
+        lines = ["Startup profile (ms since start):"]
+        lines += [f"  {name:<24}{ms:9.1f}" for name, ms in sorted(self.marks.items(), key=lambda item: item[1])]
+        lines += ["Startup spans (ms):"]
+        lines += [f"  {name:<24}{ms:9.1f}" for name, ms in self.spans.items()]
+        logging.info("\n".join(lines))
+        print("STARTUP_PROFILE " + json.dumps({"marks": self.marks, "spans": self.spans}), flush=True)
@@ -0,0 +1,209 @@
+import logging
+from datetime import timedelta
+from PyQt5.QtCore import QObject, pyqtSignal
+from time_source import SystemClock
+
+# Wake up a few ms after each boundary so a tick never lands just before the second it should show
+TICK_SLACK_MS = 5
+
+# Wall time running this far ahead of or behind monotonic time between two wakeups is a clock jump
+JUMP_TOLERANCE = timedelta(seconds=2)
+# Events later than this count as missed and are handled by the missed event policy
+MISSED_EVENT_GRACE = timedelta(seconds=30)
+
+# What happens to events missed while suspended or skipped over by a clock jump:
+#   fire_once - the first missed event fires once, late
+#   coalesce  - one event of each missed kind, for its latest boundary: the last missed hour is
+#               announced and a single flash stands for all the missed flashes
+#   skip      - missed events are dropped and the next upcoming boundary is planned
+MISSED_EVENT_POLICIES = ("fire_once", "coalesce", "skip")
+DEFAULT_MISSED_EVENT_POLICY = "fire_once"
+
+
+class TickScheduler(QObject):
+    """
+    Drives the clock from single-shot timers armed for exact wall-clock deadlines.
+
+    One timer is armed for the next second boundary (display refresh) and one for the
+    next event deadline (regular flash or top of the hour). Whenever the scheduler wakes,
+    any deadline that has already passed is fired once, so a late wakeup can delay an
+    event but never skip it. Time and timers come from the injected clock.
+
+    Every wakeup also compares how far the wall clock and the monotonic clock moved since
+    the previous one. A difference means the wall clock jumped (suspend/resume, an NTP or
+    manual step, or a DST/time zone change); the deadlines are then re-planned right away
+    and events that were slept or stepped through are handled by the config's
+    missed_event_policy. Detection rides on the existing wakeups, so it costs no polling.
+    """
+
+    tick = pyqtSignal(object)       # datetime of the second that just started
+    hour_reached = pyqtSignal(int)  # hour that just started
+    flash_due = pyqtSignal()
+    time_jumped = pyqtSignal(str, float)  # "suspend", "step" or "dst", and the jump in seconds
+
+    def __init__(self, config, parent=None, clock=None):
+        super().__init__(parent)
+        self.config = config
+        self.clock = clock or SystemClock()
+
+        self._tick_timer = self.clock.create_timer(self)
+        self._tick_timer.setSingleShot(True)
+        self._tick_timer.timeout.connect(self._on_tick)
+
+        self._deadline_timer = self.clock.create_timer(self)
+        self._deadline_timer.setSingleShot(True)
+        self._deadline_timer.timeout.connect(self._on_deadline)
+
+        self._next_deadline = None
+        self._next_is_hour = False
+        self.fired_deadline = None  # deadline of the event being emitted, for skew measurements
+        self.tick_boundary = None  # second boundary the current tick was armed for; None if immediate
+        self._ticking = True
+        self._tick_holders = set()  # holders currently wanting ticks; see set_ticking
+        self._last_wake = None  # (wall time, monotonic ms, UTC offset, suspended ms) at the last wakeup
+
+    def start(self):
+        """Plan the first event deadline and emit the first tick immediately."""
+        now = self.clock.now()
+        self._check_clock(now)
+        self._plan_next_event(now)
+        self._on_tick()
+
+    def stop(self):
+        self._tick_timer.stop()
+        self._deadline_timer.stop()
+
+    def set_ticking(self, enabled, holder=None):
+        """
+        Pause or resume the per-second ticks on behalf of holder. When several windows share
+        the scheduler each passes itself, and ticks run while any of them wants them.
+        Event deadlines stay armed either way.
+        """
+        if enabled:
+            self._tick_holders.add(holder)
+        else:
+            self._tick_holders.discard(holder)
+        enabled = bool(self._tick_holders)
+        if enabled == self._ticking:
+            return
+        self._ticking = enabled
+        if enabled:
+            self.tick_boundary = None
+            self._on_tick()
+        else:
+            self._tick_timer.stop()
+
+    def reschedule(self):
+        """Recompute the next event deadline, e.g. after flash_regularity has changed."""
+        self._plan_next_event(self.clock.now())
+
+    def _on_tick(self):
+        now = self.clock.now()
+        self._check_clock(now)
+        if self._ticking:
+            self.tick.emit(now)
+            self.tick_boundary = now.replace(microsecond=0) + timedelta(seconds=1)
+            self._tick_timer.start(1000 - now.microsecond // 1000 + TICK_SLACK_MS)
+        self._fire_due_events(now)
+
+    def _on_deadline(self):
+        now = self.clock.now()
+        self._check_clock(now)
+        self._fire_due_events(now)
+
+    def _check_clock(self, now):
+        """Detect a wall-clock jump since the previous wakeup and re-plan the deadlines if there was one."""
+        wake = (now, self.clock.monotonic_ms(), self.clock.utc_offset(), self.clock.suspended_ms())
+        last, self._last_wake = self._last_wake, wake
+        if last is None:
+            return
+        jump = (now - last[0]) - timedelta(milliseconds=wake[1] - last[1])
+        if abs(jump) < JUMP_TOLERANCE:
+            return
+
+        offset_change = wake[2] - last[2]
+        if offset_change:
+            kind = "dst"
+            # Local deadlines name instants; keep pointing at the same instant under the new offset
+            if self._next_deadline is not None:
+                self._next_deadline += offset_change
+        elif wake[3] is not None and last[3] is not None and timedelta(milliseconds=wake[3] - last[3]) >= JUMP_TOLERANCE:
+            kind = "suspend"
+        else:
+            kind = "step"
+        logging.info(f"Wall clock jumped {jump.total_seconds():+.0f} s ({kind}) at {now:%Y-%m-%d %H:%M:%S}; re-planning events")
+
+        self.tick_boundary = None
+        if self._next_deadline is not None and now < self._next_deadline:
+            # Nothing overdue: the next boundary after the new time may be a different one
+            self._plan_next_event(now)
+        self.time_jumped.emit(kind, jump.total_seconds())
+
+    def _fire_due_events(self, now):
+        """Fire the pending event if its deadline has passed, then plan the next one."""
+        if self._next_deadline is None or now < self._next_deadline:
+            return
+        deadline = self._next_deadline
+        lateness = now - deadline
+        if lateness > timedelta(seconds=1):
+            logging.info(f"Catching up on event due at {deadline:%H:%M:%S} ({lateness} late)")
+
+        events = [(deadline, self._next_is_hour)]
+        if lateness > MISSED_EVENT_GRACE:
+            policy = self.missed_event_policy()
+            if policy == "skip":
+                logging.info(f"Skipping events missed since {deadline:%H:%M:%S}")
+                self._plan_next_event(now)
+                return
+            if policy == "coalesce":
+                events = self._latest_missed_events(deadline, now)
+
+        # Plan ahead before emitting so handlers always see the following deadline armed
+        self._plan_next_event(now)
+        for deadline, is_hour in events:
+            self.fired_deadline = deadline
+            if is_hour:
+                self.hour_reached.emit(deadline.hour)  # the hour that was due, not the current one
+            else:
+                self.flash_due.emit()
+
+    def _latest_missed_events(self, first, now):
+        """The latest hour and the latest flash boundary from first to now, as (deadline, is_hour), oldest first."""
+        events = []
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        if hour >= first:
+            events.append((hour, True))
+
+        regularity = max(int(self.config.flash_regularity), 1)
+        flash = now.replace(second=0, microsecond=0)
+        minute = flash.minute - flash.minute % regularity
+        if minute == 0:
+            # Minute 0 belongs to the hourly switch; the latest flash was in the previous hour, if any
+            flash -= timedelta(hours=1)
+            minute = 59 - 59 % regularity
+        if minute and flash.replace(minute=minute) >= first:
+            events.append((flash.replace(minute=minute), False))
+        return sorted(events)
+
+    def missed_event_policy(self):
+        policy = getattr(self.config, "missed_event_policy", DEFAULT_MISSED_EVENT_POLICY)
+        if policy not in MISSED_EVENT_POLICIES:
+            logging.warning(f"Unknown missed_event_policy {policy!r}, using {DEFAULT_MISSED_EVENT_POLICY}")
+            return DEFAULT_MISSED_EVENT_POLICY
+        return policy
+
+    def _plan_next_event(self, now):
+        """Arm the deadline timer for the next flash or hour boundary strictly after now."""
+        next_minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+        regularity = max(int(self.config.flash_regularity), 1)
+        remainder = next_minute.minute % regularity
+        next_flash = next_minute + timedelta(minutes=(regularity - remainder) % regularity)
+
+        # The hourly switch takes priority over a flash landing on the same boundary
+        self._next_is_hour = next_hour <= next_flash
+        self._next_deadline = next_hour if self._next_is_hour else next_flash
+
+        delay_ms = int((self._next_deadline - now).total_seconds() * 1000) + TICK_SLACK_MS
+        self._deadline_timer.start(max(delay_ms, 0))
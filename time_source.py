@@ -0,0 +1,182 @@
+import heapq
+import itertools
+import time
+from datetime import datetime, timedelta
+from PyQt5.QtCore import QCoreApplication, QObject, QTimer, Qt, pyqtSignal
+
+_CLOCK_BOOTTIME = getattr(time, "CLOCK_BOOTTIME", None)  # Linux only
+
+
+class SystemClock:
+    """
+    Real time: the wall clock comes from datetime.now() and timers are Qt PreciseTimers.
+
+    Everything that schedules work by time (TickScheduler, FlashEngine, MainWindow and
+    WiggleFlash) asks its clock for the time and for timers instead of using datetime and
+    QTimer directly, so a SimulatedClock can be swapped in.
+    """
+
+    def now(self):
+        return datetime.now()
+
+    def monotonic_ms(self):
+        return time.monotonic_ns() // 1_000_000
+
+    def utc_offset(self):
+        return timedelta(seconds=time.localtime().tm_gmtoff)
+
+    def suspended_ms(self):
+        """Total time the machine has been suspended since boot, or None where the OS doesn't tell."""
+        if _CLOCK_BOOTTIME is None:
+            return None
+        # CLOCK_BOOTTIME keeps counting through suspend, CLOCK_MONOTONIC doesn't
+        return (time.clock_gettime_ns(_CLOCK_BOOTTIME) - time.monotonic_ns()) // 1_000_000
+
+    def create_timer(self, parent=None):
+        timer = QTimer(parent)
+        timer.setTimerType(Qt.PreciseTimer)
+        return timer
+
+    def single_shot(self, msec, callback):
+        QTimer.singleShot(msec, Qt.PreciseTimer, callback)
+
+
+class SimulatedTimer(QObject):
+    """QTimer stand-in driven by a SimulatedClock; implements the subset of QTimer the app uses."""
+
+    timeout = pyqtSignal()
+
+    def __init__(self, clock, parent=None):
+        super().__init__(parent)
+        self._clock = clock
+        self._interval = 0
+        self._single_shot = False
+        self._due_ms = None
+        self._generation = 0
+
+    def setSingleShot(self, single_shot):
+        self._single_shot = single_shot
+
+    def isSingleShot(self):
+        return self._single_shot
+
+    def setInterval(self, msec):
+        self._interval = int(msec)
+
+    def interval(self):
+        return self._interval
+
+    def setTimerType(self, timer_type):
+        pass  # simulated timers are always exact
+
+    def isActive(self):
+        return self._due_ms is not None
+
+    def remainingTime(self):
+        if self._due_ms is None:
+            return -1
+        return max(self._due_ms - self._clock.monotonic_ms(), 0)
+
+    def start(self, msec=None):
+        if msec is not None:
+            self._interval = int(msec)
+        self._generation += 1
+        self._due_ms = self._clock.monotonic_ms() + max(self._interval, 0)
+        self._clock._schedule(self)
+
+    def stop(self):
+        self._generation += 1
+        self._due_ms = None
+
+    def _fire(self):
+        if self._single_shot:
+            self._due_ms = None
+        else:
+            # A zero-interval repeating timer would never let simulated time move on
+            self._due_ms += max(self._interval, 1)
+            self._clock._schedule(self)
+        self.timeout.emit()
+
+
+class SimulatedClock:
+    """
+    Virtual time that only moves when told to.
+
+    run_for() jumps from one timer deadline to the next, firing each timer in order, so a
+    day of ticks, flashes and hourly switches runs as fast as the handlers allow. Qt events
+    (repaints, deferred calls) are processed after every timer unless process_events is off.
+    step(), suspend() and shift_utc_offset() move the wall clock the way NTP, a laptop lid
+    and DST do; timers follow monotonic time, as real ones do.
+    """
+
+    def __init__(self, start=None, process_events=True):
+        self._start = start or datetime.now().replace(microsecond=0)
+        self._now_ms = 0
+        self._wall_offset = timedelta()  # wall clock minus monotonic progress, from steps and suspends
+        self._suspended_ms = 0
+        self._utc_offset = timedelta()
+        self._queue = []  # (due ms, sequence, timer, generation)
+        self._sequence = itertools.count()
+        self._single_shots = set()
+        self.process_events = process_events
+
+    def now(self):
+        return self._start + self._wall_offset + timedelta(milliseconds=self._now_ms)
+
+    def monotonic_ms(self):
+        return self._now_ms
+
+    def utc_offset(self):
+        return self._utc_offset
+
+    def suspended_ms(self):
+        return self._suspended_ms
+
+    def step(self, delta):
+        """Set the wall clock forward (or back, for a negative delta) without time passing."""
+        self._wall_offset += delta
+
+    def suspend(self, duration):
+        """Sleep: the wall clock moves on, monotonic time and timers stand still."""
+        self._wall_offset += duration
+        self._suspended_ms += int(duration / timedelta(milliseconds=1))
+
+    def shift_utc_offset(self, delta):
+        """A DST or time zone change: local wall time and the UTC offset both move by delta."""
+        self._wall_offset += delta
+        self._utc_offset += delta
+
+    def create_timer(self, parent=None):
+        return SimulatedTimer(self, parent)
+
+    def single_shot(self, msec, callback):
+        timer = SimulatedTimer(self)
+        timer.setSingleShot(True)
+        self._single_shots.add(timer)
+
+        def fire():
+            self._single_shots.discard(timer)
+            callback()
+
+        timer.timeout.connect(fire)
+        timer.start(msec)
+
+    def run_for(self, duration):
+        """Advance virtual time by duration (a timedelta or milliseconds), firing due timers."""
+        if isinstance(duration, timedelta):
+            duration = duration / timedelta(milliseconds=1)
+        self.run_until_ms(self._now_ms + int(duration))
+
+    def run_until_ms(self, target_ms):
+        while self._queue and self._queue[0][0] <= target_ms:
+            due_ms, _, timer, generation = heapq.heappop(self._queue)
+            if generation != timer._generation:
+                continue  # stopped or restarted since this entry was queued
+            self._now_ms = due_ms
+            timer._fire()
+            if self.process_events:
+                QCoreApplication.processEvents()
+        self._now_ms = max(self._now_ms, target_ms)
+
+    def _schedule(self, timer):
+        heapq.heappush(self._queue, (timer._due_ms, next(self._sequence), timer, timer._generation))